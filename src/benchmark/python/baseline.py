@@ -0,0 +1,155 @@
+# Atom, Literal and Rule as they were before interning, kept for benchmarks_memory.py.
+import re
+from enum import Enum
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Union
+
+from dataclasses import dataclass
+
+Value = Union[bool, int, float, str]
+Variable = str
+Term = Union[Value, Variable]
+Substitutions = Dict[Variable, Term]
+
+
+@dataclass(init=True, repr=False, eq=True, order=True)
+class Atom:
+    functor: str
+    terms: List[Term]
+
+    def __hash__(self) -> int:
+        return hash(repr(self))
+
+    def __repr__(self) -> str:
+        if not self.terms:
+            return self.functor
+
+        return '%s(%s)' % (self.functor, ', '.join(str(term) for term in self.terms))
+
+    def arity(self) -> int:
+        return len(self.terms)
+
+    def is_ground(self) -> bool:
+        for term in self.terms:
+            if self.is_variable(term):
+                return False
+
+        return True
+
+    def unifies(self, ground: 'Atom') -> Optional[Substitutions]:
+        if not isinstance(ground, Atom):
+            return None
+
+        if self.functor != ground.functor:
+            return None
+
+        if self.arity() != ground.arity():
+            return None
+
+        substitutions = {}
+        for i, term in enumerate(self.terms):
+            if self.is_variable(term):
+                if term not in substitutions:
+                    substitutions[term] = ground.terms[i]
+                elif substitutions[term] != ground.terms[i]:
+                    return None
+
+            elif term != ground.terms[i]:
+                return None
+
+        return substitutions
+
+    def substitutes(self, subs: Substitutions) -> 'Atom':
+        return Atom(self.functor, [subs.get(term, '_') if self.is_variable(term) else term for term in self.terms])
+
+    @classmethod
+    def is_variable(cls, term: Term) -> bool:
+        return type(term) is str and re.match(r'[_A-Z][a-z_0-9]*', term)
+
+
+@dataclass(init=True, repr=False, eq=True, order=True)
+class Literal:
+    negated: bool
+    atom: Atom
+
+    def __hash__(self) -> int:
+        return hash(repr(self))
+
+    def __repr__(self) -> str:
+        return ('~' if self.negated else '') + repr(self.atom)
+
+    @property
+    def functor(self) -> str:
+        return self.atom.functor
+
+    @property
+    def terms(self) -> List[Term]:
+        return self.atom.terms
+
+    def arity(self) -> int:
+        return self.atom.arity()
+
+    def is_ground(self) -> bool:
+        return self.atom.is_ground()
+
+    def unifies(self, ground: 'Literal') -> Optional[Substitutions]:
+        if not isinstance(ground, Literal):
+            return None
+
+        if self.negated != ground.negated:
+            return None
+
+        return self.atom.unifies(ground.atom)
+
+    def substitutes(self, subs: Substitutions) -> 'Literal':
+        return Literal(self.negated, self.atom.substitutes(subs))
+
+    def get_complement(self):
+        return Literal(not self.negated, self.atom)
+
+    def as_fact(self) -> 'Rule':
+        return Rule(self, RuleType.STRICT, [])
+
+
+class RuleType(Enum):
+    STRICT = 0
+    DEFEASIBLE = 1
+
+
+@dataclass(init=True, repr=False, eq=True, order=True)
+class Rule:
+    head: Literal
+    type: RuleType
+    body: List[Literal]
+    salience: int = 0
+
+    def __hash__(self) -> int:
+        return hash(repr(self))
+
+    def __repr__(self) -> str:
+        content = repr(self.head)
+        if self.body or self.type == RuleType.DEFEASIBLE:
+            content += ' <- ' if self.type == RuleType.STRICT else ' -< '
+        if self.body:
+            content += ', '.join(repr(literal) for literal in self.body)
+        content += '.'
+        return content
+
+    def is_fact(self) -> bool:
+        return self.type == RuleType.STRICT and not self.body
+
+    def is_presumption(self) -> bool:
+        return self.type == RuleType.DEFEASIBLE and not self.body
+
+    def is_ground(self) -> bool:
+        for literal in [self.head, *self.body]:
+            if not literal.is_ground():
+                return False
+
+        return True
+
+    def as_literals(self) -> Set[Literal]:
+        return {self.head, *self.body}
@@ -0,0 +1,49 @@
+import sys
+
+from workloads import fact
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.rete import ReteNetwork
+
+
+def readings(size: int, levels: int) -> list:
+    rules = [fact('limit', 's%d' % i, i % levels) for i in range(size // 10)]
+    for i in range(size):
+        rules.append(fact('reading', 's%d' % (i % (size // 10)), i * 7 % levels))
+
+    return rules
+
+
+def explicit(size: int, levels: int) -> Program:
+    rules = [Rule.parse('alarm(S, V) -< reading(S, V), limit(S, L), greater(V, L).')]
+    for i in range(levels):
+        for j in range(i):
+            rules.append(fact('greater', i, j))
+
+    return Program([*rules, *readings(size, levels)])
+
+
+def builtin(size: int, levels: int) -> Program:
+    return Program([Rule.parse('alarm(S, V) -< reading(S, V), limit(S, L), V > L.'), *readings(size, levels)])
+
+
+def ground(program: Program) -> ReteNetwork:
+    network = ReteNetwork()
+    network.add_program(program)
+
+    return network
+
+
+def main(size: int, levels: int):
+    for name, workload in (('explicit greater/2 facts', explicit), ('built-in V > L', builtin)):
+        network, seconds = timed(ground, workload(size, levels))
+        memory = sum(len(node.memory) for node in network.table.values())
+        report('%s: %d readings, %d levels' % (name, size, levels), seconds,
+               '%d ground rules, %d tokens in memories' % (len(network.agenda), memory))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, int(sys.argv[2]) if len(sys.argv) > 2 else 500)
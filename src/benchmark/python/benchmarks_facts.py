@@ -0,0 +1,49 @@
+import gc
+import sys
+import tracemalloc
+
+from workloads import fact
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+
+
+def as_rules(size: int):
+    return [fact('reading', 's%d' % (i % 100), i, i * 0.5) for i in range(size)]
+
+
+def as_program(size: int) -> Program:
+    program = Program([Rule.parse('alarm(S) <- reading(S, T, V), threshold(S, V).')])
+    for i in range(size):
+        program.add_rule(fact('reading', 's%d' % (i % 100), i, i * 0.5))
+
+    return program
+
+
+def measure(title: str, function, size: int):
+    gc.collect()
+    tracemalloc.start()
+    result, seconds = timed(function, size)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report(title, seconds, '%8.1f MiB retained' % (current / 2 ** 20), '%8.1f MiB peak' % (peak / 2 ** 20))
+
+    return result
+
+
+def main(size: int):
+    measure('%d facts as Rule objects' % size, as_rules, size)
+    program = measure('%d facts in a columnar Program' % size, as_program, size)
+
+    _, seconds = timed(program.facts.contains, Literal.parse('reading(s7, 7, 3.5)'))
+    report('membership check', seconds)
+    count, seconds = timed(lambda: sum(1 for _ in program.get_facts().heads()))
+    report('scan %d fact heads' % count, seconds)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,31 @@
+import sys
+
+from workloads import fact
+from workloads import family
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Program
+
+
+def reground(program: Program) -> Program:
+    return Program(list(program.rules)).get_ground_program()
+
+
+def main(size: int):
+    program = family(size)
+    ground, seconds = timed(program.get_ground_program)
+    report('ground family(%d)' % size, seconds, '%d ground rules' % len(ground.rules))
+
+    _, seconds = timed(program.add_rule, fact('parent', 'p%d' % (size - 1), 'q'))
+    report('add one fact incrementally', seconds, '%d ground rules' % len(ground.rules))
+
+    _, seconds = timed(program.remove_rule, fact('parent', 'p0', 'p1'))
+    report('retract one fact incrementally', seconds, '%d ground rules' % len(ground.rules))
+
+    ground, seconds = timed(reground, program)
+    report('reground from scratch', seconds, '%d ground rules' % len(ground.rules))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
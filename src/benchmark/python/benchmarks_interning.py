@@ -0,0 +1,39 @@
+import sys
+
+from workloads import birds
+from workloads import family
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Literal
+from depysible.domain.interpretation import Interpreter
+from depysible.domain.rete import fire_rules
+
+
+def hash_by_repr(rules) -> int:
+    return len({hash(repr(rule)) for rule in rules})
+
+
+def hash_interned(rules) -> int:
+    return len({hash(rule) for rule in rules})
+
+
+def main(size: int):
+    program = family(size)
+    rules, seconds = timed(fire_rules, program)
+    report('fire_rules(family(%d))' % size, seconds, '%d ground rules' % len(rules))
+
+    _, seconds = timed(hash_by_repr, rules * 10)
+    report('hash(repr(rule)) x10', seconds)
+    _, seconds = timed(hash_interned, rules * 10)
+    report('hash(rule) x10 (interned)', seconds)
+
+    program = birds(size // 250)
+    interpreter, seconds = timed(Interpreter, program)
+    report('Interpreter(birds(%d))' % (size // 250), seconds)
+    _, seconds = timed(interpreter.query, Literal.parse('flies(b1)'))
+    report('query(flies(b1))', seconds)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,27 @@
+import sys
+
+from workloads import birds
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Literal
+from depysible.domain.interpretation import Interpreter
+
+
+def main(size: int):
+    literal = Literal.parse('flies(b%d)' % (size // 2))
+    program = birds(size)
+    relevant, seconds = timed(program.get_relevant_program, literal)
+    report('get_relevant_program(birds(%d), %r)' % (size, literal), seconds, '%d rules' % len(relevant.rules))
+
+    interpreter = Interpreter(program, lazy=True)
+    (answer, _), seconds = timed(interpreter.query, literal)
+    report('lazy query(birds(%d), %r)' % (size, literal), seconds, answer.name)
+
+    ground, seconds = timed(program.get_ground_program)
+    report('get_ground_program(birds(%d))' % size, seconds, '%d rules' % len(ground.rules))
+
+
+if __name__ == '__main__':
+    for size in map(int, sys.argv[1:] or ['10000', '100000']):
+        main(size)
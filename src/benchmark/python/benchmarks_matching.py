@@ -0,0 +1,63 @@
+import sys
+
+from workloads import fact
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Variable
+from depysible.domain.rete import Alfa
+from depysible.domain.rete import Root
+
+
+def unify_naive(pattern, ground):
+    if pattern.functor != ground.functor or pattern.arity() != ground.arity():
+        return None
+
+    substitutions = {}
+    for i, term in enumerate(pattern.terms):
+        if type(term) is Variable:
+            if term not in substitutions:
+                substitutions[term] = ground.terms[i]
+            elif substitutions[term] != ground.terms[i]:
+                return None
+        elif term != ground.terms[i]:
+            return None
+
+    return substitutions
+
+
+def match_naive(patterns, grounds) -> int:
+    return sum(1 for pattern in patterns for ground in grounds if unify_naive(pattern, ground) is not None)
+
+
+def match_compiled(patterns, grounds) -> int:
+    matchers = [pattern.matcher for pattern in patterns]
+    return sum(1 for matcher in matchers for ground in grounds if matcher.match(ground) is not None)
+
+
+def activate(patterns, grounds) -> int:
+    root = Root()
+    alfas = [Alfa(pattern, root) for pattern in patterns]
+    for ground in grounds:
+        for alfa in alfas:
+            alfa.notify(ground, (), root)
+
+    return sum(len(alfa.memory) for alfa in alfas)
+
+
+def main(size: int):
+    patterns = [Literal.parse(text) for text in ['edge(X, Y)', 'edge(X, X)', 'edge(n0, Y)', 'node(X)']]
+    grounds = [fact('edge', 'n%d' % (i % 97), 'n%d' % (i % 89)).head for i in range(size)]
+    atoms = [pattern.atom for pattern in patterns]
+
+    count, seconds = timed(match_naive, atoms, [ground.atom for ground in grounds])
+    report('naive unification (%d x %d)' % (len(atoms), size), seconds, '%d matches' % count)
+    count, seconds = timed(match_compiled, atoms, [ground.atom for ground in grounds])
+    report('compiled matchers (%d x %d)' % (len(atoms), size), seconds, '%d matches' % count)
+    count, seconds = timed(activate, patterns, grounds[:size // 10])
+    report('Alfa activation (%d x %d)' % (len(patterns), size // 10), seconds, '%d tokens' % count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
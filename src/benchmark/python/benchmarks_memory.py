@@ -0,0 +1,113 @@
+import gc
+import sys
+import tracemalloc
+from types import ModuleType
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import baseline
+from workloads import fact
+from workloads import report
+from workloads import timed
+
+from depysible.domain import definitions
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.definitions import Variable
+from depysible.domain.rete import fire_rules
+from depysible.domain.rete import stream_rules
+
+
+def build(classes: ModuleType, variable: Callable, size: int) -> tuple:
+    def literal(negated: bool, functor: str, *terms) -> classes.Literal:
+        return classes.Literal(negated, classes.Atom(functor, list(terms)))
+
+    s, t = variable('S'), variable('T')
+    rules = [
+        classes.Rule(literal(False, 'observed', s, t), classes.RuleType.STRICT, [literal(False, 'reading', s, t)]),
+        classes.Rule(literal(True, 'calibrated', s), classes.RuleType.DEFEASIBLE, [literal(False, 'observed', s, t)]),
+    ]
+    facts = [literal(False, 'reading', 's%d' % (i % 100), i) for i in range(size)]
+
+    return rules, facts
+
+
+def ground(classes: ModuleType, variable: Callable, size: int) -> list:
+    rules, facts = build(classes, variable, size)
+    known: Dict[tuple, List] = {}
+    for literal in facts:
+        known.setdefault((literal.negated, literal.functor), []).append(literal)
+    ground = [classes.Rule(literal, classes.RuleType.STRICT, []) for literal in facts]
+    seen = set(ground)
+
+    changed = True
+    while changed:
+        changed = False
+        for rule in rules:
+            matches = [({}, [])]
+            for pattern in rule.body:
+                matches = [({**subs, **found}, [*grounds, literal])
+                           for subs, grounds in matches
+                           for literal in list(known.get((pattern.negated, pattern.functor), ()))
+                           for found in [pattern.unifies(literal)]
+                           if found is not None and all(subs.get(k, v) == v for k, v in found.items())]
+            for subs, grounds in matches:
+                derived = classes.Rule(rule.head.substitutes(subs), rule.type, grounds)
+                if derived not in seen:
+                    seen.add(derived)
+                    ground.append(derived)
+                    known.setdefault((derived.head.negated, derived.head.functor), []).append(derived.head)
+                    changed = True
+
+    return ground
+
+
+def ground_before(size: int) -> list:
+    return ground(baseline, str, size)
+
+
+def ground_after(size: int) -> list:
+    return ground(definitions, Variable, size)
+
+
+def sensors(size: int) -> Program:
+    program = Program([
+        Rule.parse('observed(S, T) <- reading(S, T).'),
+        Rule.parse('~calibrated(S) -< observed(S, T).'),
+    ])
+    for i in range(size):
+        program.add_rule(fact('reading', 's%d' % (i % 100), i))
+
+    return program
+
+
+def count_streamed(program: Program) -> int:
+    return sum(1 for _ in stream_rules(program))
+
+
+def measure(title: str, function: Callable, *args):
+    gc.collect()
+    tracemalloc.start()
+    ground, seconds = timed(function, *args)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = ground if isinstance(ground, int) else len(ground)
+    report(title, seconds, '%d ground rules' % count)
+    print('    retained %8.1f MiB (%d bytes per ground rule)' % (current / 2 ** 20, current // count))
+    print('    peak     %8.1f MiB' % (peak / 2 ** 20))
+
+
+def main(size: int):
+    measure('before: baseline classes, %d facts' % size, ground_before, size)
+    measure('after: interned slotted classes, %d facts' % size, ground_after, size)
+
+    program = sensors(size)
+    measure('fire_rules: %d facts' % size, fire_rules, program)
+    measure('stream_rules: %d facts' % size, count_streamed, program)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
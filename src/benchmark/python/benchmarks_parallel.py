@@ -0,0 +1,37 @@
+import sys
+
+from workloads import birds
+from workloads import fact
+from workloads import family
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain import parallel
+from depysible.domain import rete
+
+
+def chain(size: int) -> Program:
+    rules = [Rule.parse('reaches(X, Y) <- edge(X, Y).'), Rule.parse('reaches(X, Z) <- reaches(X, Y), edge(Y, Z).')]
+    for i in range(size // 50):
+        rules.append(fact('edge', 'n%d' % i, 'n%d' % (i + 1)))
+
+    return Program(rules)
+
+
+def main(size: int):
+    for name, workload in [('birds', birds), ('family', family), ('chain', chain)]:
+        program = workload(size)
+        expected, seconds = timed(rete.fire_rules, program)
+        report('sequential %s(%d)' % (name, size), seconds, '%d ground rules' % len(expected))
+        for workers in [1, 2, 4, 8]:
+            rules, seconds = timed(parallel.fire_rules, program, workers)
+            same = len(rules) == len(expected) and set(rules) == set(expected)
+            report('parallel %s(%d), %d workers' % (name, size, workers), seconds,
+                   '%d ground rules' % len(rules), 'identical' if same else 'DIFFERENT')
+
+
+if __name__ == '__main__':
+    for size in map(int, sys.argv[1:] or ['10000', '100000']):
+        main(size)
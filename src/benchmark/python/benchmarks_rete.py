@@ -0,0 +1,75 @@
+import sys
+
+from workloads import birds
+from workloads import fact
+from workloads import family
+from workloads import report
+from workloads import timed
+
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.rete import Beta
+from depysible.domain.rete import ReteNetwork
+from depysible.domain.rete import fire_rules
+
+
+def predicates(size: int, count: int = 300) -> Program:
+    rules = [Rule.parse('q%d(X) <- p%d(X, c%d).' % (k, k, k)) for k in range(count)]
+    for i in range(size):
+        k = i % count
+        rules.append(fact('p%d' % k, 'i%d' % i, 'c%d' % (k if i % 2 else k + 1)))
+
+    return Program(rules)
+
+
+def skewed(size: int, count: int = 10) -> Program:
+    rules = [Rule.parse('r(X, Z) <- big(X, Y), big(Y, Z), tiny(Z).')]
+    for i in range(size):
+        rules.append(fact('big', 'n%d' % (i % (size // 10 or 1)), 'n%d' % i))
+    for i in range(count):
+        rules.append(fact('tiny', 'n%d' % i))
+
+    return Program(rules)
+
+
+def renamed(size: int, count: int = 100) -> Program:
+    rules = [Rule.parse('h%d(X%d, Z%d) <- p(X%d, Y%d), q(Y%d, Z%d).' % ((k,) * 7)) for k in range(count)]
+    for i in range(size):
+        rules.append(fact('p', 'n%d' % i, 'm%d' % (i % 100)))
+    for i in range(100):
+        rules.append(fact('q', 'm%d' % i, 'o%d' % i))
+
+    return Program(rules)
+
+
+def main(size: int):
+    for name, workload in [('birds', birds), ('family', family), ('predicates', predicates)]:
+        program = workload(size)
+        facts = sum(1 for _ in program.get_facts())
+        rules, seconds = timed(fire_rules, program)
+        report('fire_rules(%s) on %d facts' % (name, facts), seconds, '%d ground rules' % len(rules))
+
+    program = skewed(size)
+    for planned in [False, True]:
+        network = ReteNetwork(planned=planned)
+        rules, seconds = timed(network.add_program, program)
+        beta = sum(len(node.memory) for node in network.table.values() if isinstance(node, Beta))
+        report('%s(skewed) on %d facts' % ('planned' if planned else 'source order', size), seconds,
+               '%d ground rules' % len(rules), '%d beta tokens' % beta)
+
+    program = family(size)
+    for instrumented in [False, True]:
+        rules, seconds = timed(ReteNetwork(instrumented=instrumented).add_program, program)
+        report('%s(family) on %d facts' % ('instrumented' if instrumented else 'plain', size), seconds,
+               '%d ground rules' % len(rules))
+
+    network = ReteNetwork()
+    rules, seconds = timed(network.add_program, renamed(size // 10))
+    tokens = sum(len(node.memory) for node in network.table.values())
+    report('shared(renamed) on %d facts' % (size // 10 + 100), seconds, '%d ground rules' % len(rules),
+           '%d nodes' % len(network.table), '%d tokens' % tokens)
+
+
+if __name__ == '__main__':
+    for size in map(int, sys.argv[1:] or ['10000', '100000']):
+        main(size)
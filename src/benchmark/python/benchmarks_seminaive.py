@@ -0,0 +1,35 @@
+import gc
+import sys
+import tracemalloc
+
+from workloads import birds
+from workloads import family
+from workloads import report
+from workloads import timed
+
+from depysible.domain import rete
+from depysible.domain import seminaive
+
+
+def measure(title: str, function, program):
+    gc.collect()
+    rules, seconds = timed(function, program)
+    del rules
+    gc.collect()
+    tracemalloc.start()
+    rules = function(program)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report(title, seconds, '%d ground rules' % len(rules), '%8.1f MiB peak' % (peak / 2 ** 20))
+
+
+def main(size: int):
+    for name, workload in [('birds', birds), ('family', family)]:
+        program = workload(size)
+        measure('rete %s(%d)' % (name, size), rete.derive_rules, program)
+        measure('seminaive %s(%d)' % (name, size), seminaive.derive_rules, program)
+
+
+if __name__ == '__main__':
+    for size in map(int, sys.argv[1:] or ['10000', '100000']):
+        main(size)
@@ -0,0 +1,31 @@
+import io
+import sys
+
+from workloads import birds
+from workloads import family
+from workloads import report
+from workloads import timed
+
+
+def save(program) -> bytes:
+    file = io.BytesIO()
+    program.save_snapshot(file)
+
+    return file.getvalue()
+
+
+def main(size: int):
+    for name, workload in (('birds', birds), ('family', family)):
+        ground, seconds = timed(lambda: workload(size).get_ground_program())
+        report('%s(%d): ground from scratch' % (name, size), seconds, '%d ground rules' % len(ground.rules))
+
+        content, seconds = timed(save, workload(size))
+        report('%s(%d): save snapshot' % (name, size), seconds, '%.1f KiB' % (len(content) / 1024))
+
+        program = workload(size)
+        ground, seconds = timed(program.load_snapshot, io.BytesIO(content))
+        report('%s(%d): warm start from snapshot' % (name, size), seconds, '%d ground rules' % len(ground.rules))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
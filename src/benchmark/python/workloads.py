@@ -0,0 +1,55 @@
+import time
+from typing import Any
+from typing import Callable
+from typing import Tuple
+
+from depysible.domain.definitions import Atom
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.definitions import RuleType
+
+
+def birds(size: int) -> Program:
+    rules = [
+        Rule.parse('bird(X) <- chicken(X).'),
+        Rule.parse('bird(X) <- penguin(X).'),
+        Rule.parse('~flies(X) <- penguin(X).'),
+        Rule.parse('flies(X) -< bird(X).'),
+        Rule.parse('flies(X) -< chicken(X), scared(X).'),
+        Rule.parse('~flies(X) -< chicken(X).'),
+        Rule.parse('nests_in_trees(X) -< flies(X).'),
+    ]
+    for i in range(size):
+        name = 'b%d' % i
+        rules.append(fact('penguin' if i % 3 == 0 else 'chicken', name))
+        if i % 2 == 0:
+            rules.append(fact('scared', name))
+
+    return Program(rules)
+
+
+def family(size: int) -> Program:
+    rules = [
+        Rule.parse('grandparent(X, Y) <- parent(X, Z), parent(Z, Y).'),
+        Rule.parse('ancestor(X, Y) <- parent(X, Y).'),
+    ]
+    for i in range(1, size):
+        rules.append(fact('parent', 'p%d' % ((i - 1) // 2), 'p%d' % i))
+
+    return Program(rules)
+
+
+def fact(functor: str, *terms: Any) -> Rule:
+    return Rule(Literal(False, Atom(functor, list(terms))), RuleType.STRICT, [])
+
+
+def timed(function: Callable, *args: Any) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = function(*args)
+
+    return result, time.perf_counter() - start
+
+
+def report(title: str, seconds: float, *extra: str):
+    print('%-48s %10.4fs %s' % (title, seconds, ' '.join(extra)))
@@ -0,0 +1,106 @@
+import operator
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+from depysible.domain.symbols import SYMBOLS
+
+COMPARISONS: Dict[str, Callable] = {
+    '=': operator.eq,
+    '\\=': operator.ne,
+    '<': operator.lt,
+    '=<': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+ARITHMETIC: Dict[str, Callable] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+NUMBERS = (int, float)
+
+
+def is_builtin(literal: 'Literal') -> bool:
+    return literal.functor in COMPARISONS or literal.functor in ARITHMETIC
+
+
+class Builtin:
+    def __init__(self, literal: 'Literal', bound: Iterable['Variable']):
+        bound = set(bound)
+        atom = literal.atom
+        terms = literal.terms
+        self.literal = literal
+        self.functor = literal.functor
+        self.arithmetic = self.functor in ARITHMETIC
+        self.function = ARITHMETIC[self.functor] if self.arithmetic else COMPARISONS[self.functor]
+
+        self.output = None
+        if self.arithmetic or self.functor == '=':
+            for i in range(1 if self.arithmetic else 2):
+                if atom.is_variable(terms[i]) and terms[i] not in bound:
+                    self.output = i
+                    break
+
+        self.target = terms[self.output] if self.output is not None else None
+        self.inputs = tuple(term for i, term in enumerate(terms) if i != self.output)
+        self.missing = tuple(term for term in self.inputs if atom.is_variable(term) and term not in bound)
+
+    def __repr__(self) -> str:
+        return repr(self.literal)
+
+    def evaluate(self, values: Sequence['Term']) -> Optional[Tuple['Term', ...]]:
+        if self.arithmetic:
+            left, right = values[-2:]
+            if type(left) not in NUMBERS or type(right) not in NUMBERS:
+                return None
+            try:
+                result = self.function(left, right)
+            except ArithmeticError:
+                return None
+            if self.output is not None:
+                return SYMBOLS.decode(SYMBOLS.encode(result)),
+
+            return () if values[0] == result else None
+
+        if self.output is not None:
+            return values[0],
+
+        try:
+            return () if self.function(*values) else None
+        except TypeError:
+            return None
+
+
+def arrange(literals: Iterable['Literal'], builtins: Iterable['Literal']) -> List[Tuple['Literal', Optional[Builtin]]]:
+    pending = list(builtins)
+    bound: Set['Variable'] = set()
+    arranged = []
+    for literal in literals:
+        arranged.append((literal, None))
+        bound.update(literal.atom.matcher.variables)
+        ready = True
+        while ready:
+            ready = False
+            for builtin in pending:
+                compiled = Builtin(builtin, bound)
+                if not compiled.missing:
+                    arranged.append((builtin, compiled))
+                    if compiled.target is not None:
+                        bound.add(compiled.target)
+                    pending.remove(builtin)
+                    ready = True
+                    break
+
+    if pending:
+        raise ValueError('Built-in is not bound by an ordinary body literal: %r' % pending[0])
+
+    return arranged
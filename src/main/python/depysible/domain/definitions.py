@@ -1,80 +1,268 @@
-import re
+import collections.abc
+import hashlib
+import heapq
+import io
 from enum import Enum
+from itertools import chain
+from typing import AbstractSet
+from typing import BinaryIO
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Set
+from typing import TextIO
+from typing import Tuple
 from typing import Union
+from weakref import WeakValueDictionary
 
 from dataclasses import dataclass
 
+from depysible.domain.builtins import ARITHMETIC
+from depysible.domain.builtins import COMPARISONS
+from depysible.domain.builtins import arrange
+from depysible.domain.builtins import is_builtin
+from depysible.domain.facts import FINGERPRINT
+from depysible.domain.facts import FactStore
+from depysible.domain.symbols import SYMBOLS
+
 Value = Union[bool, int, float, str]
-Variable = str
+
+
+class Variable(str):
+    __slots__ = ()
+
+
 Term = Union[Value, Variable]
 Substitutions = Dict[Variable, Term]
+Binding = Tuple[Term, ...]
+Predicate = Tuple[bool, str, int]
+SortKey = tuple
+
+
+def _assign(instance: object, **attributes):
+    for name, value in attributes.items():
+        object.__setattr__(instance, name, value)
+
+
+def _term_key(term: Term) -> SortKey:
+    if isinstance(term, str):
+        return 1, term, type(term) is Variable
+
+    return 0, term, type(term).__name__
+
+
+def sort_key(item: Union['Atom', 'Literal', 'Rule']) -> SortKey:
+    return item.sort_key
+
+
+class Sortable:
+    __slots__ = ()
+
+    def __lt__(self, other: 'Sortable') -> bool:
+        if not isinstance(other, Sortable):
+            return NotImplemented
+
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: 'Sortable') -> bool:
+        if not isinstance(other, Sortable):
+            return NotImplemented
+
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: 'Sortable') -> bool:
+        if not isinstance(other, Sortable):
+            return NotImplemented
+
+        return self.sort_key > other.sort_key
 
+    def __ge__(self, other: 'Sortable') -> bool:
+        if not isinstance(other, Sortable):
+            return NotImplemented
+
+        return self.sort_key >= other.sort_key
+
+
+@dataclass(init=False, repr=False, eq=True, frozen=True)
+class Atom(Sortable):
+    __slots__ = ('functor', 'codes', 'ground', '_terms', '_sort_key', '_matcher', '_hash', '_positive', '_negative',
+                 '__weakref__')
 
-@dataclass(init=True, repr=False, eq=True, order=True)
-class Atom:
     functor: str
-    terms: List[Term]
+
+    _table = WeakValueDictionary()
+
+    def __new__(cls, functor: str, terms: Iterable[Term]) -> 'Atom':
+        codes = SYMBOLS.encode_all((functor, *terms))
+        atom = cls._table.get(codes)
+        if atom is None:
+            atom = super().__new__(cls)
+            functor, *terms = SYMBOLS.decode_all(codes)
+            _assign(
+                atom,
+                functor=functor,
+                codes=codes,
+                ground=not any(type(term) is Variable for term in terms),
+                _terms=None,
+                _sort_key=None,
+                _matcher=None,
+                _hash=hash(codes),
+                _positive=None,
+                _negative=None,
+            )
+            atom = cls._table.setdefault(codes, atom)
+
+        return atom
+
+    @classmethod
+    def from_codes(cls, codes: Tuple[int, ...]) -> 'Atom':
+        atom = cls._table.get(codes)
+        if atom is None:
+            functor, *terms = SYMBOLS.decode_all(codes)
+            atom = cls(functor, terms)
+
+        return atom
+
+    def __reduce__(self) -> tuple:
+        return Atom, (self.functor, self.terms)
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
 
     def __hash__(self) -> int:
-        return hash(repr(self))
+        return self._hash
 
     def __repr__(self) -> str:
         if not self.terms:
             return self.functor
 
+        if self.functor in COMPARISONS and len(self.terms) == 2:
+            return '%s %s %s' % (self.terms[0], self.functor, self.terms[1])
+
+        if self.functor in ARITHMETIC and len(self.terms) == 3:
+            return '%s = %s %s %s' % (self.terms[0], self.terms[1], self.functor, self.terms[2])
+
         return '%s(%s)' % (self.functor, ', '.join(str(term) for term in self.terms))
 
+    @property
+    def terms(self) -> Tuple[Term, ...]:
+        if self._terms is None:
+            object.__setattr__(self, '_terms', tuple(SYMBOLS.decode_all(self.codes[1:])))
+
+        return self._terms
+
+    @property
+    def sort_key(self) -> SortKey:
+        if self._sort_key is None:
+            object.__setattr__(self, '_sort_key', (self.functor, tuple([_term_key(term) for term in self.terms])))
+
+        return self._sort_key
+
     def arity(self) -> int:
         return len(self.terms)
 
     def is_ground(self) -> bool:
-        for term in self.terms:
-            if self.is_variable(term):
-                return False
+        return self.ground
 
-        return True
+    @property
+    def matcher(self) -> 'Matcher':
+        if self._matcher is None:
+            object.__setattr__(self, '_matcher', Matcher(self))
+
+        return self._matcher
 
     def unifies(self, ground: 'Atom') -> Optional[Substitutions]:
         if not isinstance(ground, Atom):
             return None
 
-        if self.functor != ground.functor:
+        matcher = self.matcher
+        binding = matcher.match(ground)
+        if binding is None:
             return None
 
-        if self.arity() != ground.arity():
+        return dict(zip(matcher.variables, binding))
+
+    def substitutes(self, subs: Substitutions) -> 'Atom':
+        if self.ground:
+            return self
+
+        return Atom(self.functor, [subs.get(term, ANONYMOUS) if type(term) is Variable else term
+                                   for term in self.terms])
+
+    @classmethod
+    def is_variable(cls, term: Term) -> bool:
+        return type(term) is Variable
+
+
+ANONYMOUS = Variable('_')
+
+
+class Matcher:
+    def __init__(self, pattern: Atom):
+        self.pattern = pattern
+        self.functor = pattern.codes[0]
+        self.size = len(pattern.codes)
+
+        constants, variables, bindings, repeats = [], [], [], []
+        for i, term in enumerate(pattern.terms):
+            if type(term) is not Variable:
+                constants.append((i + 1, pattern.codes[i + 1]))
+            elif term in variables:
+                repeats.append((i + 1, bindings[variables.index(term)]))
+            else:
+                variables.append(term)
+                bindings.append(i + 1)
+
+        self.constants = tuple(constants)
+        self.variables = tuple(variables)
+        self.bindings = tuple(bindings)
+        self.repeats = tuple(repeats)
+
+    def match(self, ground: Atom) -> Optional[Binding]:
+        codes = ground.codes
+        if codes[0] != self.functor or len(codes) != self.size:
             return None
 
-        substitutions = {}
-        for i, term in enumerate(self.terms):
-            if self.is_variable(term):
-                if term not in substitutions:
-                    substitutions[term] = ground.terms[i]
-                elif substitutions[term] != ground.terms[i]:
-                    return None
+        for i, code in self.constants:
+            if codes[i] != code:
+                return None
 
-            elif term != ground.terms[i]:
+        for i, j in self.repeats:
+            if codes[i] != codes[j]:
                 return None
 
-        return substitutions
+        return tuple(SYMBOLS.decode_all([codes[i] for i in self.bindings]))
 
-    def substitutes(self, subs: Substitutions) -> 'Atom':
-        return Atom(self.functor, [subs.get(term, '_') if self.is_variable(term) else term for term in self.terms])
-
-    @classmethod
-    def is_variable(cls, term: Term) -> bool:
-        return type(term) is str and re.match(r'[_A-Z][a-z_0-9]*', term)
 
+@dataclass(init=False, repr=False, eq=True, frozen=True)
+class Literal(Sortable):
+    __slots__ = ('negated', 'atom', 'predicate', '_sort_key', '_hash')
 
-@dataclass(init=True, repr=False, eq=True, order=True)
-class Literal:
     negated: bool
     atom: Atom
 
+    _predicates = {}
+
+    def __new__(cls, negated: bool, atom: Atom) -> 'Literal':
+        negated = bool(negated)
+        literal = atom._negative if negated else atom._positive
+        if literal is None:
+            literal = super().__new__(cls)
+            predicate = (negated, atom.functor, len(atom.codes) - 1)
+            _assign(
+                literal,
+                negated=negated,
+                atom=atom,
+                predicate=cls._predicates.setdefault(predicate, predicate),
+                _sort_key=None,
+                _hash=hash((negated, atom)),
+            )
+            object.__setattr__(atom, '_negative' if negated else '_positive', literal)
+
+        return literal
+
     @staticmethod
     def parse(content: str) -> 'Literal':
         from arpeggio import ParserPython
@@ -87,25 +275,38 @@ class Literal:
 
         return visit_parse_tree(parse_tree, DefeasibleVisitor())
 
+    def __reduce__(self) -> tuple:
+        return Literal, (self.negated, self.atom)
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
+
     def __hash__(self) -> int:
-        return hash(repr(self))
+        return self._hash
 
     def __repr__(self) -> str:
         return ('~' if self.negated else '') + repr(self.atom)
 
+    @property
+    def sort_key(self) -> SortKey:
+        if self._sort_key is None:
+            object.__setattr__(self, '_sort_key', (self.negated, self.atom.sort_key))
+
+        return self._sort_key
+
     @property
     def functor(self) -> str:
         return self.atom.functor
 
     @property
-    def terms(self) -> List[Term]:
+    def terms(self) -> Tuple[Term, ...]:
         return self.atom.terms
 
     def arity(self) -> int:
         return self.atom.arity()
 
     def is_ground(self) -> bool:
-        return self.atom.is_ground()
+        return self.atom.ground
 
     def unifies(self, ground: 'Literal') -> Optional[Substitutions]:
         if not isinstance(ground, Literal):
@@ -137,12 +338,46 @@ class RuleType(Enum):
     DEFEASIBLE = 1
 
 
-@dataclass(init=True, repr=False, eq=True, order=True)
-class Rule:
+class RuleKind(Enum):
+    FACT = 0
+    PRESUMPTION = 1
+    STRICT = 2
+    DEFEASIBLE = 3
+
+
+@dataclass(init=False, repr=False, eq=True, frozen=True)
+class Rule(Sortable):
+    __slots__ = ('head', 'type', 'body', 'salience', 'kind', '_sort_key', '_hash', '__weakref__')
+
     head: Literal
     type: RuleType
-    body: List[Literal]
-    salience: int = 0
+    body: Tuple[Literal, ...]
+    salience: int
+
+    _table = WeakValueDictionary()
+
+    def __new__(cls, head: Literal, type: RuleType, body: Iterable[Literal], salience: int = 0) -> 'Rule':
+        key = (head, type, tuple(body), salience)
+        rule = cls._table.get(key)
+        if rule is None:
+            rule = super().__new__(cls)
+            if type == RuleType.STRICT:
+                kind = RuleKind.STRICT if key[2] else RuleKind.FACT
+            else:
+                kind = RuleKind.DEFEASIBLE if key[2] else RuleKind.PRESUMPTION
+            _assign(
+                rule,
+                head=head,
+                type=type,
+                body=key[2],
+                salience=salience,
+                kind=kind,
+                _sort_key=None,
+                _hash=hash(key),
+            )
+            rule = cls._table.setdefault(key, rule)
+
+        return rule
 
     @staticmethod
     def parse(content: str) -> 'Rule':
@@ -156,8 +391,14 @@ class Rule:
 
         return visit_parse_tree(parse_tree, DefeasibleVisitor())
 
+    def __reduce__(self) -> tuple:
+        return Rule, (self.head, self.type, self.body, self.salience)
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
+
     def __hash__(self) -> int:
-        return hash(repr(self))
+        return self._hash
 
     def __repr__(self) -> str:
         content = repr(self.head)
@@ -168,15 +409,23 @@ class Rule:
         content += '.'
         return content
 
+    @property
+    def sort_key(self) -> SortKey:
+        if self._sort_key is None:
+            body = tuple([literal.sort_key for literal in self.body])
+            object.__setattr__(self, '_sort_key', (self.head.sort_key, self.type.value, body, self.salience))
+
+        return self._sort_key
+
     def is_fact(self) -> bool:
-        return self.type == RuleType.STRICT and not self.body
+        return self.kind is RuleKind.FACT
 
     def is_presumption(self) -> bool:
-        return self.type == RuleType.DEFEASIBLE and not self.body
+        return self.kind is RuleKind.PRESUMPTION
 
     def is_ground(self) -> bool:
         for literal in [self.head, *self.body]:
-            if not literal.is_ground():
+            if not literal.is_ground() or is_builtin(literal):
                 return False
 
         return True
@@ -185,12 +434,51 @@ class Rule:
         return {self.head, *self.body}
 
 
-@dataclass(init=True, repr=False, eq=True, order=True)
+RuleIndex = Dict[Rule, None]
+
+
+class RuleView(collections.abc.Set):
+    def __init__(self, rules: Iterable[Rule], facts: Optional[FactStore] = None):
+        self.rules = rules
+        self.facts = facts
+
+    def __contains__(self, rule: object) -> bool:
+        return rule in self.rules or self.facts is not None and rule in self.facts
+
+    def __iter__(self) -> Iterator[Rule]:
+        yield from self.rules
+        if self.facts is not None:
+            yield from self.facts
+
+    def __len__(self) -> int:
+        return len(self.rules) + (len(self.facts) if self.facts is not None else 0)
+
+    def heads(self) -> Iterator[Literal]:
+        for rule in self.rules:
+            yield rule.head
+        if self.facts is not None:
+            yield from self.facts.heads()
+
+
+@dataclass(init=False, repr=False, eq=True)
 class Program:
-    rules: List[Rule]
-    _ground: 'Program' = None
-    _strict: Set[Rule] = None
-    _defeasible: Set[Rule] = None
+    _rules: RuleIndex
+    _facts: FactStore
+
+    def __init__(self, rules: Iterable[Rule] = ()):
+        self._rules = {}
+        self._facts = FactStore()
+        self._kinds = {kind: {} for kind in RuleKind}
+        self._heads = {}
+        self._bodies = {}
+        self._strict = {}
+        self._defeasible = {}
+        self._non_ground = 0
+        self._fingerprint = 0
+        self._ground = None
+        self._network = None
+        self._grounding = None
+        self.add_rules(rules)
 
     @staticmethod
     def parse(content: str) -> 'Program':
@@ -207,98 +495,279 @@ class Program:
         return program
 
     def __hash__(self) -> int:
-        return hash(repr(self))
+        return hash((self._fingerprint, self._facts.fingerprint))
 
     def __repr__(self) -> str:
-        parts = []
-
-        stricts = {}
-        for strict in self.get_rules(RuleType.STRICT):
-            stricts.setdefault(strict.head.atom, set()).add(strict)
-        if stricts:
-            parts.append(
-                '# Strict rules\n%s' %
-                '\n'.join(repr(rule) for atom in sorted(stricts) for rule in sorted(stricts[atom]))
-            )
+        buffer = io.StringIO()
+        self.dump(buffer)
 
-        facts = {}
-        for fact in self.get_facts():
-            facts.setdefault(fact.head.atom, set()).add(fact)
-        if facts:
-            parts.append(
-                '# Facts\n%s' %
-                '\n'.join(repr(rule) for atom in sorted(facts) for rule in sorted(facts[atom]))
-            )
+        return buffer.getvalue()
 
-        defeasibles = {}
-        for defeasible in self.get_rules(RuleType.DEFEASIBLE):
-            defeasibles.setdefault(defeasible.head.atom, set()).add(defeasible)
-        presumptions = {}
-        for presumption in self.get_presumptions():
-            presumptions.setdefault(presumption.head.atom, set()).add(presumption)
-        if defeasibles or presumptions:
-            parts.append(
-                '# Defeasible knowledge\n%s' %
-                '\n'.join(part for part in [
-                    '\n'.join(repr(rule) for atom in sorted(defeasibles) for rule in sorted(defeasibles[atom])),
-                    '\n'.join(repr(rule) for atom in sorted(presumptions) for rule in sorted(presumptions[atom])),
-                ] if part)
-            )
+    def dump(self, file: TextIO, ordered: bool = True):
+        sections = [
+            ('# Strict rules', [self.get_rules(RuleType.STRICT)]),
+            ('# Facts', [self.get_facts()]),
+            ('# Defeasible knowledge', [self.get_rules(RuleType.DEFEASIBLE), self.get_presumptions()]),
+        ]
+
+        separator = ''
+        for title, groups in sections:
+            if not any(groups):
+                continue
+
+            file.write(separator + title)
+            for rules in groups:
+                for rule in self._ordered(rules) if ordered else rules:
+                    file.write('\n' + repr(rule))
+            separator = '\n\n'
+
+    @staticmethod
+    def _ordered(rules: Iterable[Rule]) -> Iterator[Rule]:
+        def key(rule: Rule) -> SortKey:
+            return rule.head.atom.sort_key, rule.sort_key
+
+        if not isinstance(rules, RuleView) or rules.facts is None:
+            return iter(sorted(rules, key=key))
 
-        return '\n\n'.join(parts)
+        facts = (literal.as_fact() for literal in rules.facts.heads(ordered=True))
+        return heapq.merge(sorted(rules.rules, key=key), facts, key=key)
 
-    def get_facts(self) -> Iterable[Rule]:
-        return (rule for rule in self.rules if rule.is_fact())
+    @property
+    def rules(self) -> RuleView:
+        return RuleView(self._rules.keys(), self._facts)
+
+    @property
+    def facts(self) -> FactStore:
+        return self._facts
+
+    def add_rule(self, rule: Rule) -> bool:
+        if self._is_stored(rule):
+            if not self._facts.add(rule.head):
+                return False
+
+            self._propagate(rule)
+            return True
+
+        if rule in self._rules:
+            return False
+
+        self._validate(rule)
+        self._rules[rule] = None
+        self._kinds[rule.kind][rule] = None
+        self._partition(rule)[rule] = None
+        self._heads.setdefault(rule.head.predicate, {}).setdefault(rule.kind, {})[rule] = None
+        for literal in rule.body:
+            self._bodies.setdefault(literal.predicate, {}).setdefault(rule.kind, {})[rule] = None
+        if not rule.is_ground():
+            self._non_ground += 1
+        self._fingerprint = (self._fingerprint + hash(rule)) & FINGERPRINT
+        self._propagate(rule)
+
+        return True
 
-    def get_presumptions(self) -> Iterable[Rule]:
-        return (rule for rule in self.rules if rule.is_presumption())
+    def add_rules(self, rules: Iterable[Rule]) -> List[Rule]:
+        return [rule for rule in rules if self.add_rule(rule)]
+
+    def remove_rule(self, rule: Rule) -> bool:
+        if self._is_stored(rule):
+            if not self._facts.remove(rule.head):
+                return False
+
+            self._retract(rule)
+            return True
+
+        if rule not in self._rules:
+            return False
+
+        del self._rules[rule]
+        del self._kinds[rule.kind][rule]
+        del self._partition(rule)[rule]
+        self._unindex(self._heads, rule.head.predicate, rule)
+        for literal in rule.body:
+            self._unindex(self._bodies, literal.predicate, rule)
+        if not rule.is_ground():
+            self._non_ground -= 1
+        self._fingerprint = (self._fingerprint - hash(rule)) & FINGERPRINT
+        self._retract(rule)
+
+        return True
+
+    def remove_rules(self, rules: Iterable[Rule]) -> List[Rule]:
+        return [rule for rule in rules if self.remove_rule(rule)]
+
+    @staticmethod
+    def _validate(rule: Rule):
+        builtins = [literal for literal in rule.body if is_builtin(literal)]
+        if builtins:
+            arrange([literal for literal in rule.body if not is_builtin(literal)], builtins)
+
+    @staticmethod
+    def _is_stored(rule: Rule) -> bool:
+        return rule.kind is RuleKind.FACT and rule.is_ground() and not rule.salience
+
+    @staticmethod
+    def _unindex(index: Dict[Predicate, Dict[RuleKind, RuleIndex]], predicate: Predicate, rule: Rule):
+        kinds = index.get(predicate, {})
+        rules = kinds.get(rule.kind, {})
+        rules.pop(rule, None)
+        if not rules:
+            kinds.pop(rule.kind, None)
+        if not kinds:
+            index.pop(predicate, None)
+
+    def _partition(self, rule: Rule) -> RuleIndex:
+        return self._strict if rule.type == RuleType.STRICT else self._defeasible
+
+    def _propagate(self, rule: Rule):
+        if self._network is None:
+            self._ground = None
+            return
+
+        if not rule.body:
+            self._ground.add_rule(rule)
+        self._ground.add_rules(self._network.add_rule(rule))
+
+    def _retract(self, rule: Rule):
+        if self._network is None or rule.body:
+            self._invalidate()
+            return
+
+        self._ground.remove_rule(rule)
+        self._ground.remove_rules(self._network.retract(rule.head))
+
+    def _invalidate(self):
+        self._ground = None
+        self._network = None
+
+    def get_facts(self) -> RuleView:
+        return RuleView(self._kinds[RuleKind.FACT].keys(), self._facts)
+
+    def get_presumptions(self) -> RuleView:
+        return RuleView(self._kinds[RuleKind.PRESUMPTION].keys())
 
     def get_rules(self, type: RuleType = None) -> Iterable[Rule]:
-        return (rule for rule in self.rules
-                if not (rule.is_fact() or rule.is_presumption() or type and rule.type != type))
+        if type == RuleType.STRICT:
+            return self._kinds[RuleKind.STRICT].keys()
 
-    def get_strict(self) -> Set[Rule]:
-        program = self.get_ground_program()
+        if type == RuleType.DEFEASIBLE:
+            return self._kinds[RuleKind.DEFEASIBLE].keys()
 
-        program._strict, program._defeasible = set(), set()
-        for rule in program.rules:
-            if rule.type == RuleType.STRICT:
-                program._strict.add(rule)
-            else:
-                program._defeasible.add(rule)
+        return [*self._kinds[RuleKind.STRICT], *self._kinds[RuleKind.DEFEASIBLE]]
+
+    def get_rules_by_kind(self, kind: RuleKind) -> Iterable[Rule]:
+        if kind is RuleKind.FACT:
+            return self.get_facts()
 
-        return program._strict
+        return self._kinds[kind].keys()
+
+    def get_rules_by_head(self, predicate: Predicate, kind: RuleKind = None) -> Iterable[Rule]:
+        rules = self._lookup(self._heads, predicate, kind)
+        table = self._facts.table(predicate)
+        if table is not None and kind in (None, RuleKind.FACT):
+            return RuleView(rules, table)
+
+        return rules
+
+    def get_rules_by_body(self, predicate: Predicate, kind: RuleKind = None) -> Iterable[Rule]:
+        return self._lookup(self._bodies, predicate, kind)
+
+    @staticmethod
+    def _lookup(index: Dict[Predicate, Dict[RuleKind, RuleIndex]], predicate: Predicate,
+                kind: RuleKind = None) -> Iterable[Rule]:
+        kinds = index.get(predicate, {})
+        if kind is not None:
+            return kinds.get(kind, {}).keys()
 
-    def get_defeasible(self) -> Set[Rule]:
+        return [rule for kind in RuleKind for rule in kinds.get(kind, ())]
+
+    def get_predicates(self) -> Iterable[Predicate]:
+        return {**dict.fromkeys(self._heads), **dict.fromkeys(self._facts.predicates())}.keys()
+
+    def get_strict(self) -> AbstractSet[Rule]:
         program = self.get_ground_program()
 
-        if program._defeasible is None:
-            program._strict, program._defeasible = set(), set()
-            for rule in program.rules:
-                if rule.type == RuleType.STRICT:
-                    program._strict.add(rule)
-                else:
-                    program._defeasible.add(rule)
+        return RuleView(program._strict.keys(), program._facts)
 
-        return program._defeasible
+    def get_defeasible(self) -> AbstractSet[Rule]:
+        return self.get_ground_program()._defeasible.keys()
 
     def as_literals(self) -> Iterable[Literal]:
         return (literal for literal in {literal for rule in self.rules for literal in {rule.head, *rule.body}})
 
     def is_ground(self) -> bool:
-        for rule in self.rules:
-            if not rule.is_ground():
-                return False
+        return not self._non_ground
 
-        return True
+    def get_ground_program(self, salience: Optional[bool] = None, strategy: Optional[str] = None) -> 'Program':
+        from depysible.domain import parallel
+        from depysible.domain import seminaive
+        from depysible.domain.rete import ReteNetwork
 
-    def get_ground_program(self) -> 'Program':
-        from depysible.domain.rete import fire_rules
+        if strategy not in (None, 'rete', 'seminaive', 'parallel'):
+            raise ValueError('Unknown grounding strategy: %s' % strategy)
 
         if self.is_ground():
             return self
 
-        if not self._ground:
-            self._ground = Program(fire_rules(self))
+        current = self._grounding or (False, 'rete')
+        grounding = (current[0] if salience is None else salience, current[1] if strategy is None else strategy)
+        if grounding != self._grounding:
+            self._invalidate()
+            self._grounding = grounding
+        salience, strategy = grounding
+
+        if self._ground is None:
+            ground = Program([*self._kinds[RuleKind.FACT], *self._kinds[RuleKind.PRESUMPTION]])
+            ground._facts = self._facts.copy()
+            if strategy == 'seminaive':
+                ground.add_rules(seminaive.derive_rules(self))
+            elif strategy == 'parallel':
+                ground.add_rules(parallel.derive_rules(self))
+            else:
+                self._network = ReteNetwork(salience)
+                ground.add_rules(self._network.add_program(self))
+            self._ground = ground
 
         return self._ground
+
+    def digest(self) -> str:
+        total = 0
+        for text in chain((repr(rule) for rule in self._rules), (repr(literal) for literal in self._facts.heads())):
+            total += int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+        return '%016x%08x' % (total & FINGERPRINT, len(self._rules) + len(self._facts))
+
+    def save_snapshot(self, file: BinaryIO, salience: bool = False):
+        if self.is_ground():
+            raise ValueError('Ground programs have no network to snapshot')
+
+        if self._network is None:
+            self.get_ground_program(salience, 'rete')
+
+        self._network.save(file, self.digest())
+
+    def load_snapshot(self, file: BinaryIO) -> 'Program':
+        from depysible.domain.rete import ReteNetwork
+
+        network = ReteNetwork.load(file, self.digest())
+        ground = Program([*self._kinds[RuleKind.FACT], *self._kinds[RuleKind.PRESUMPTION]])
+        ground._facts = self._facts.copy()
+        ground.add_rules(network.agenda)
+        self._network = network
+        self._ground = ground
+        self._grounding = (network.root.salience, 'rete')
+
+        return ground
+
+    def get_relevant_program(self, literal: Literal) -> 'Program':
+        from depysible.domain import magic
+
+        rules = magic.derive_rules(self, literal)
+        literals = {literal, *(body for rule in rules for body in (rule.head, *rule.body))}
+        literals.update([other.get_complement() for other in literals])
+
+        facts = [literal.as_fact() for literal in literals if self._facts.contains(literal)]
+        for predicate in {literal.predicate for literal in literals}:
+            for kind in (RuleKind.FACT, RuleKind.PRESUMPTION):
+                facts.extend(rule for rule in self._lookup(self._heads, predicate, kind) if rule.head in literals)
+
+        return Program([*facts, *rules])
@@ -0,0 +1,210 @@
+from array import array
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from depysible.domain.symbols import Code
+
+Row = Tuple[Code, ...]
+
+FINGERPRINT = (1 << 64) - 1
+
+
+class FactTable:
+    def __init__(self, predicate: 'Predicate'):
+        from depysible.domain.symbols import SYMBOLS
+
+        self.predicate = predicate
+        self.negated, self.functor, self.arity = predicate
+        self.code = SYMBOLS.encode(self.functor)
+        self.columns = [array('q') for _ in range(self.arity)]
+        self._rows: Dict[int, Union[int, List[int]]] = {}
+        self._size = 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FactTable):
+            return False
+
+        if self.predicate != other.predicate or len(self) != len(other):
+            return False
+
+        return all(other.find(row) is not None for row in self.rows())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator['Rule']:
+        return (literal.as_fact() for literal in self.heads())
+
+    def __contains__(self, rule: 'Rule') -> bool:
+        return rule.is_fact() and not rule.salience and self.contains(rule.head)
+
+    def row(self, index: int) -> Row:
+        return tuple([column[index] for column in self.columns])
+
+    def rows(self) -> Iterator[Row]:
+        if not self.arity:
+            return iter([()] * self._size)
+
+        return zip(*self.columns)
+
+    def find(self, row: Row) -> Optional[int]:
+        entry = self._rows.get(hash(row))
+        if entry is None:
+            return None
+
+        if type(entry) is int:
+            return entry if self.row(entry) == row else None
+
+        for index in entry:
+            if self.row(index) == row:
+                return index
+
+        return None
+
+    def contains(self, literal: 'Literal') -> bool:
+        return literal.predicate == self.predicate and self.find(literal.atom.codes[1:]) is not None
+
+    def add(self, literal: 'Literal') -> bool:
+        row = literal.atom.codes[1:]
+        if self.find(row) is not None:
+            return False
+
+        for column, code in zip(self.columns, row):
+            column.append(code)
+        self._register(row, self._size)
+        self._size += 1
+
+        return True
+
+    def remove(self, literal: 'Literal') -> bool:
+        row = literal.atom.codes[1:]
+        index = self.find(row)
+        if index is None:
+            return False
+
+        self._unregister(row, index)
+        last = self._size - 1
+        if index != last:
+            moved = self.row(last)
+            self._unregister(moved, last)
+            for column, code in zip(self.columns, moved):
+                column[index] = code
+            self._register(moved, index)
+        for column in self.columns:
+            column.pop()
+        self._size -= 1
+
+        return True
+
+    def _register(self, row: Row, index: int):
+        key = hash(row)
+        entry = self._rows.get(key)
+        if entry is None:
+            self._rows[key] = index
+        elif type(entry) is int:
+            self._rows[key] = [entry, index]
+        else:
+            entry.append(index)
+
+    def _unregister(self, row: Row, index: int):
+        key = hash(row)
+        entry = self._rows[key]
+        if type(entry) is int:
+            del self._rows[key]
+        else:
+            entry.remove(index)
+            if len(entry) == 1:
+                self._rows[key] = entry[0]
+
+    def heads(self) -> Iterator['Literal']:
+        from depysible.domain.definitions import Atom
+        from depysible.domain.definitions import Literal
+
+        for row in self.rows():
+            yield Literal(self.negated, Atom.from_codes((self.code, *row)))
+
+    def copy(self) -> 'FactTable':
+        table = FactTable(self.predicate)
+        table.columns = [array('q', column) for column in self.columns]
+        table._rows = {key: entry if type(entry) is int else [*entry] for key, entry in self._rows.items()}
+        table._size = self._size
+
+        return table
+
+
+class FactStore:
+    def __init__(self):
+        self.tables: Dict['Predicate', FactTable] = {}
+        self.fingerprint = 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FactStore) and self.tables == other.tables
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self.tables.values())
+
+    def __iter__(self) -> Iterator['Rule']:
+        return (literal.as_fact() for literal in self.heads())
+
+    def __contains__(self, rule: 'Rule') -> bool:
+        return rule.is_fact() and not rule.salience and self.contains(rule.head)
+
+    def table(self, predicate: 'Predicate') -> Optional[FactTable]:
+        return self.tables.get(predicate)
+
+    def predicates(self) -> Iterable['Predicate']:
+        return self.tables.keys()
+
+    def contains(self, literal: 'Literal') -> bool:
+        table = self.tables.get(literal.predicate)
+        return table is not None and table.contains(literal)
+
+    def add(self, literal: 'Literal') -> bool:
+        table = self.tables.get(literal.predicate)
+        if table is None:
+            table = self.tables[literal.predicate] = FactTable(literal.predicate)
+
+        if not table.add(literal):
+            return False
+
+        self.fingerprint = (self.fingerprint + hash(literal)) & FINGERPRINT
+        return True
+
+    def remove(self, literal: 'Literal') -> bool:
+        table = self.tables.get(literal.predicate)
+        if table is None or not table.remove(literal):
+            return False
+
+        if not table:
+            del self.tables[literal.predicate]
+        self.fingerprint = (self.fingerprint - hash(literal)) & FINGERPRINT
+
+        return True
+
+    def heads(self, ordered: bool = False) -> Iterator['Literal']:
+        if not ordered:
+            for table in list(self.tables.values()):
+                yield from table.heads()
+            return
+
+        functors = {}
+        for table in self.tables.values():
+            functors.setdefault(table.functor, []).append(table)
+
+        for functor in sorted(functors):
+            yield from sorted(
+                (literal for table in functors[functor] for literal in table.heads()),
+                key=lambda literal: (literal.atom.sort_key, literal.negated),
+            )
+
+    def copy(self) -> 'FactStore':
+        store = FactStore()
+        store.tables = {predicate: table.copy() for predicate, table in self.tables.items()}
+        store.fingerprint = self.fingerprint
+
+        return store
@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import Dict
+from typing import FrozenSet
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Set
@@ -13,16 +15,27 @@ from depysible.domain.definitions import Literal
 from depysible.domain.definitions import Program
 from depysible.domain.definitions import Rule
 from depysible.domain.definitions import RuleType
+from depysible.domain.definitions import RuleView
+from depysible.domain.facts import FactStore
 
 
-@dataclass(init=True, repr=False, eq=True, order=True)
+@dataclass(init=False, repr=False, eq=True, order=True, frozen=True)
 class Structure:
-    argument: Set[Rule]
+    __slots__ = ('argument', 'conclusion', 'derivation', '_hash')
+
+    argument: FrozenSet[Rule]
     conclusion: Literal
     derivation: 'Derivation'
 
+    def __init__(self, argument: Iterable[Rule], conclusion: Literal, derivation: 'Derivation'):
+        argument = frozenset(argument)
+        object.__setattr__(self, 'argument', argument)
+        object.__setattr__(self, 'conclusion', conclusion)
+        object.__setattr__(self, 'derivation', derivation)
+        object.__setattr__(self, '_hash', hash((argument, conclusion)))
+
     def __hash__(self) -> int:
-        return hash(repr(self))
+        return self._hash
 
     def __repr__(self) -> str:
         if not self.argument:
@@ -57,17 +70,13 @@ class Structure:
         if not self.argument:
             return True
 
-        index = as_index({
-            self.conclusion.as_fact(),
-            *self.derivation.interpreter.program.rules,
-        }, RuleType.STRICT)
+        index = as_index(self.derivation.interpreter.program.rules, RuleType.STRICT)
+        index.setdefault(self.conclusion, set()).add(self.conclusion.as_fact())
         if not get_derivations(structure.conclusion, index):
             return False
 
-        index = as_index({
-            structure.conclusion.as_fact(),
-            *self.derivation.interpreter.program.rules,
-        }, RuleType.STRICT)
+        index = as_index(self.derivation.interpreter.program.rules, RuleType.STRICT)
+        index.setdefault(structure.conclusion, set()).add(structure.conclusion.as_fact())
         return bool(get_derivations(self.conclusion, index))
 
     def is_more_salient_than(self, structure: 'Structure') -> bool:
@@ -124,12 +133,12 @@ class Structure:
         if self.derivation.interpreter != structure.derivation.interpreter:
             raise Exception('From different interpreters')
 
-        derivables, rules = set(), set()
-        for rule in self.derivation.interpreter.program.rules:
+        program = self.derivation.interpreter.program
+        derivables = set()
+        for rule in program.rules:
             if self.derivation.interpreter.get_derivations(rule.head, RuleType.DEFEASIBLE):
                 derivables.add(rule.head)
-            if rule.type == RuleType.STRICT and rule.body:
-                rules.add(rule)
+        rules = set(program.get_rules(RuleType.STRICT))
 
         more_specific = False
         for derivable in derivables:
@@ -162,13 +171,21 @@ class Structure:
         return True
 
 
-@dataclass(init=True, repr=False, eq=True, order=True)
+@dataclass(init=False, repr=False, eq=True, order=True, frozen=True)
 class Derivation:
-    rules: List[Rule]
+    __slots__ = ('rules', 'interpreter', '_hash')
+
+    rules: Tuple[Rule, ...]
     interpreter: 'Interpreter'
 
+    def __init__(self, rules: Iterable[Rule], interpreter: 'Interpreter'):
+        rules = tuple(rules)
+        object.__setattr__(self, 'rules', rules)
+        object.__setattr__(self, 'interpreter', interpreter)
+        object.__setattr__(self, '_hash', hash(rules))
+
     def __hash__(self) -> int:
-        return hash(repr(self))
+        return self._hash
 
     def __repr__(self) -> str:
         explanation = ', '.join(repr(rule.head) for rule in reversed(self.rules)) if self.rules else '∅'
@@ -317,17 +334,31 @@ class Answer(Enum):
 class Interpreter:
     program: Program
 
-    def __init__(self, program: Program):
-        self.program = program.get_ground_program()
+    def __init__(self, program: Program, lazy: bool = False):
+        self.lazy = lazy
+        self._source = program
+        self.program = program if lazy else program.get_ground_program()
+        self._relevant = {}
+        self._reset()
+
+    def _reset(self):
+        self._fingerprint = hash(self.program)
+        self._indexes = None
         self._defeaters = None
         self._literals = None
         self._structures = None
         self._answers = None
 
+    def _refresh(self):
+        self.program = self._source.get_ground_program()
+        if hash(self.program) != self._fingerprint:
+            self._reset()
+
     def __repr__(self) -> str:
         return repr(self.program)
 
     def get_defeaters(self) -> Summary:
+        self._refresh()
         if self._defeaters is None:
             arguments = self.get_structures(RuleType.DEFEASIBLE)
 
@@ -362,22 +393,50 @@ class Interpreter:
         return self._defeaters
 
     def get_derivations(self, literal: Literal, mode: RuleType = RuleType.DEFEASIBLE) -> Set[Derivation]:
-        if not self.program.get_facts():
+        if not self.program.get_facts() and not self.program.get_presumptions():
             return set()
 
-        index = as_index(self.program.rules, mode)
+        index = self.get_index(mode)
         if literal not in index:
             return set()
 
-        return {Derivation(rules, self) for rules in get_derivations(literal, index)}
+        derivations = {Derivation(rules, self) for rules in get_derivations(literal, index)}
+        if mode == RuleType.DEFEASIBLE:
+            derivations = {derivation for derivation in derivations if self._is_consistent(derivation)}
+
+        return derivations
+
+    def _is_consistent(self, derivation: Derivation) -> bool:
+        defeasible = [rule for rule in derivation.rules if rule.type == RuleType.DEFEASIBLE]
+        if not defeasible:
+            return True
+
+        index = as_index(self.program.rules, RuleType.STRICT)
+        for rule in defeasible:
+            index.setdefault(rule.head, set()).add(rule.head.as_fact())
+
+        return not is_contradictory(index)
+
+    def get_index(self, mode: RuleType = RuleType.DEFEASIBLE) -> 'Index':
+        self._refresh()
+        if self._indexes is None:
+            self._indexes = {}
+
+        if mode not in self._indexes:
+            rules = self.program.get_strict() if mode == RuleType.STRICT else self.program.rules
+            self._indexes[mode] = as_index(rules, mode)
+
+        return self._indexes[mode]
 
     def get_literals(self, mode: RuleType = RuleType.DEFEASIBLE) -> Set[Literal]:
+        self._refresh()
         if self._literals is None:
             self._literals = {rule.head for rule in self.program.rules if rule.type.value <= mode.value}
 
         return self._literals
 
     def get_structures(self, mode: RuleType = RuleType.DEFEASIBLE) -> Set[Structure]:
+        self._refresh()
         if self._structures is None:
             self._structures = {}
 
@@ -393,11 +452,13 @@ class Interpreter:
         return self._structures.get(mode, set())
 
     def is_contradictory(self, mode: RuleType = RuleType.DEFEASIBLE) -> Optional[Literal]:
-        index = as_index(self.program.rules, mode)
-
-        return is_contradictory(index)
+        return is_contradictory(self.get_index(mode))
 
     def query(self, literal: Literal, mode: RuleType = RuleType.DEFEASIBLE) -> Tuple[Answer, Optional[Warrant]]:
+        if self.lazy and self.program is self._source:
+            return self._query_relevant(literal, mode)
+
+        self._refresh()
         if self._answers is None:
             self._answers = {}
 
@@ -419,6 +480,13 @@ class Interpreter:
 
         return self._answers.get(mode, {}).get(literal, (Answer.UNKNOWN, None))
 
+    def _query_relevant(self, literal: Literal, mode: RuleType) -> Tuple[Answer, Optional[Warrant]]:
+        fingerprint = hash(self._source)
+        if self._relevant.get(literal, (None,))[0] != fingerprint:
+            self._relevant[literal] = fingerprint, Interpreter(self._source.get_relevant_program(literal))
+
+        return self._relevant[literal][1].query(literal, mode)
+
     def _get_warrant(self, literal: Literal, mode: RuleType = RuleType.DEFEASIBLE) -> Optional[Warrant]:
         derivations = self.get_derivations(literal, mode)
         if not derivations:
@@ -435,7 +503,32 @@ class Interpreter:
         return None
 
 
-Index = Dict[Literal, Set[Rule]]
+class Index(Dict[Literal, Set[Rule]]):
+    def __init__(self, facts: Optional[FactStore] = None):
+        super().__init__()
+        self.facts = facts
+
+    def __contains__(self, literal: object) -> bool:
+        return super().__contains__(literal) or self.facts is not None and self.facts.contains(literal)
+
+    def __missing__(self, literal: Literal) -> Set[Rule]:
+        if self.facts is not None and self.facts.contains(literal):
+            return {literal.as_fact()}
+
+        raise KeyError(literal)
+
+    def __iter__(self) -> Iterator[Literal]:
+        yield from super().__iter__()
+        if self.facts is not None:
+            for literal in self.facts.heads():
+                if not super().__contains__(literal):
+                    yield literal
+
+    def setdefault(self, literal: Literal, default: Set[Rule] = None) -> Set[Rule]:
+        if not super().__contains__(literal) and self.facts is not None and self.facts.contains(literal):
+            default = {*(default or ()), literal.as_fact()}
+
+        return super().setdefault(literal, default)
 
 
 def disagree(literal1: Literal, literal2: Literal, rules: Iterable[Rule]) -> bool:
@@ -450,7 +543,12 @@ def disagree(literal1: Literal, literal2: Literal, rules: Iterable[Rule]) -> boo
 
 
 def as_index(rules: Iterable[Rule], mode: RuleType = RuleType.DEFEASIBLE) -> Index:
-    index = {}
+    if isinstance(rules, RuleView):
+        index = Index(rules.facts)
+        rules = rules.rules
+    else:
+        index = Index()
+
     for rule in rules:
         if rule.type.value <= mode.value:
             index.setdefault(rule.head, set()).add(rule)
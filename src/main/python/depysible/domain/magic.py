@@ -0,0 +1,132 @@
+from collections import deque
+from itertools import chain
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
+
+Adornment = Tuple[bool, ...]
+Demand = Tuple['Predicate', Adornment]
+
+MAGIC = '?'
+
+
+def adorn(literal: 'Literal', bound: Set['Variable']) -> Adornment:
+    return tuple(not literal.atom.is_variable(term) or term in bound for term in literal.terms)
+
+
+def magic_literal(literal: 'Literal', adornment: Adornment) -> 'Literal':
+    from depysible.domain.definitions import Atom
+    from depysible.domain.definitions import Literal
+
+    functor = '%s%s%s/%s' % (MAGIC, '~' if literal.negated else '', literal.functor,
+                             ''.join('b' if bound else 'f' for bound in adornment))
+
+    return Literal(False, Atom(functor, [term for term, bound in zip(literal.terms, adornment) if bound]))
+
+
+def is_magic(literal: 'Literal') -> bool:
+    return literal.functor.startswith(MAGIC)
+
+
+def pattern(predicate: 'Predicate') -> 'Literal':
+    from depysible.domain.definitions import Atom
+    from depysible.domain.definitions import Literal
+    from depysible.domain.definitions import Variable
+
+    negated, functor, arity = predicate
+
+    return Literal(negated, Atom(functor, [Variable('X%d' % i) for i in range(arity)]))
+
+
+def rewrite(program: 'Program', goal: 'Literal') -> Tuple[List['Rule'], Dict['Rule', 'Rule'], List['Literal']]:
+    from depysible.domain.definitions import RuleKind
+    from depysible.domain.definitions import RuleType
+    from depysible.domain.definitions import Rule
+
+    rules: Dict['Rule', None] = {}
+    sources: Dict['Rule', 'Rule'] = {}
+    seen: Set[Demand] = set()
+    queue = deque()
+
+    def demand(literal: 'Literal', adornment: Adornment):
+        key = (literal.predicate, adornment)
+        if key not in seen:
+            seen.add(key)
+            queue.append(key)
+
+    seeds = []
+    for literal in (goal, goal.get_complement()):
+        adornment = (True,) * len(literal.terms)
+        seeds.append(magic_literal(literal, adornment))
+        demand(literal, adornment)
+
+    while queue:
+        predicate, adornment = queue.popleft()
+        literal = pattern(predicate)
+        complement = literal.get_complement()
+        rules[Rule(magic_literal(complement, adornment), RuleType.STRICT, [magic_literal(literal, adornment)])] = None
+        demand(complement, adornment)
+
+        for rule in chain(program.get_rules_by_head(predicate, RuleKind.STRICT),
+                          program.get_rules_by_head(predicate, RuleKind.DEFEASIBLE)):
+            guarded = Rule(rule.head, rule.type, [magic_literal(rule.head, adornment), *rule.body])
+            rules[guarded] = None
+            sources[guarded] = rule
+            for magic, body, flags in propagate(rule, adornment):
+                rules[magic] = None
+                demand(body, flags)
+
+        for rule in program.get_rules_by_body(predicate, RuleKind.STRICT):
+            for body in rule.body:
+                if body.predicate == predicate:
+                    bound = {term for term, flag in zip(body.terms, adornment) if flag}
+                    flags = adorn(rule.head, bound)
+                    magic = Rule(magic_literal(rule.head, flags), RuleType.STRICT, [magic_literal(body, adornment)])
+                    rules[magic] = None
+                    demand(rule.head, flags)
+
+    return list(rules), sources, seeds
+
+
+def propagate(rule: 'Rule', adornment: Adornment) -> Iterator[Tuple['Rule', 'Literal', Adornment]]:
+    from depysible.domain.builtins import is_builtin
+    from depysible.domain.definitions import RuleType
+    from depysible.domain.definitions import Rule
+
+    bound = {term for term, flag in zip(rule.head.terms, adornment) if flag}
+    guard = magic_literal(rule.head, adornment)
+    for i, body in enumerate(rule.body):
+        if is_builtin(body):
+            continue
+
+        flags = adorn(body, bound)
+        prefix = [literal for literal in rule.body[:i] if not is_builtin(literal)]
+        yield Rule(magic_literal(body, flags), RuleType.STRICT, [guard, *prefix]), body, flags
+        bound.update(body.atom.matcher.variables)
+
+
+def derive_rules(program: 'Program', goal: 'Literal') -> List['Rule']:
+    from depysible.domain.builtins import is_builtin
+    from depysible.domain.definitions import RuleKind
+    from depysible.domain.definitions import RuleView
+    from depysible.domain.seminaive import Relation
+    from depysible.domain.seminaive import TableRelation
+    from depysible.domain.seminaive import evaluate
+
+    rules, sources, seeds = rewrite(program, goal)
+    full: Dict['Predicate', Relation] = {}
+    for literal in seeds:
+        full.setdefault(literal.predicate, Relation()).add(literal)
+    predicates = {literal.predicate for rule in rules for literal in rule.body
+                  if not is_magic(literal) and not is_builtin(literal)}
+    for predicate in predicates:
+        table = program.facts.table(predicate)
+        relation = full[predicate] = Relation() if table is None else TableRelation(table)
+        for kind in (RuleKind.FACT, RuleKind.PRESUMPTION):
+            heads = program.get_rules_by_head(predicate, kind)
+            for rule in heads.rules if isinstance(heads, RuleView) else heads:
+                relation.add(rule.head)
+
+    return [rule for rule in evaluate(rules, full, sources) if not is_magic(rule.head)]
@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+from itertools import chain
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+Relations = Dict['Predicate', 'Relation']
+Round = Optional[Tuple[List['Literal'], List[int]]]
+
+
+def shard(literal: 'Literal', shards: int) -> int:
+    return hash((literal.negated, literal.atom.codes)) % shards
+
+
+def derive_rules(program: 'Program', workers: Optional[int] = None) -> List['Rule']:
+    from depysible.domain import seminaive
+    from depysible.domain.seminaive import Relation
+    from depysible.domain.seminaive import stratify
+
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return seminaive.derive_rules(program)
+
+    workers = workers or os.cpu_count() or 1
+    full: Dict['Predicate', Relation] = {}
+    for literal in chain(program.get_facts().heads(), program.get_presumptions().heads()):
+        full.setdefault(literal.predicate, Relation()).add(literal)
+
+    rules: Dict['Rule', None] = {}
+    for stratum in stratify(program.get_rules()):
+        _derive_stratum(stratum, workers, rules, full)
+
+    return list(rules)
+
+
+def fire_rules(program: 'Program', workers: Optional[int] = None) -> List['Rule']:
+    if program.is_ground():
+        return list(program.rules)
+
+    return [*program.get_facts(), *program.get_presumptions(), *derive_rules(program, workers)]
+
+
+def _derive_stratum(stratum: List['Rule'], workers: int, rules: Dict['Rule', None], full: Relations):
+    from depysible.domain.seminaive import Plan
+    from depysible.domain.seminaive import Relation
+
+    predicates = {rule.head.predicate for rule in stratum}
+    plans = [Plan(rule) for rule in stratum]
+    pivots = [[k for k, step in enumerate(plan.steps) if step.predicate in predicates] for plan in plans]
+
+    shards = [{} for _ in range(workers)]
+    for predicate in {plan.steps[0].predicate for plan in plans if plan.steps[0].predicate in full}:
+        for literal in full[predicate]:
+            shards[shard(literal, workers)].setdefault(predicate, Relation()).add(literal)
+
+    context = multiprocessing.get_context('fork')
+    connections, processes = [], []
+    try:
+        for k in range(workers):
+            connection, child = context.Pipe()
+            process = context.Process(target=_work, args=(child, full, plans, pivots, shards[k]), daemon=True)
+            process.start()
+            child.close()
+            connections.append(connection)
+            processes.append(process)
+
+        while True:
+            delta = _merge((connection.recv() for connection in connections), rules, full)
+            if not delta:
+                break
+
+            partitions = [[] for _ in range(workers)]
+            for i, literal in enumerate(delta):
+                partitions[shard(literal, workers)].append(i)
+            for connection, partition in zip(connections, partitions):
+                connection.send((delta, partition))
+    finally:
+        for connection, process in zip(connections, processes):
+            if process.is_alive():
+                connection.send(None)
+            connection.close()
+        for process in processes:
+            process.join()
+
+
+def _merge(results, rules: Dict['Rule', None], full: Dict['Predicate', 'Relation']) -> List['Literal']:
+    from depysible.domain.seminaive import Relation
+
+    delta = []
+    for result in results:
+        for rule in result:
+            if rule not in rules:
+                rules[rule] = None
+                if full.setdefault(rule.head.predicate, Relation()).add(rule.head):
+                    delta.append(rule.head)
+
+    return delta
+
+
+def _work(connection, full: Relations, plans: List['Plan'], pivots: List[List[int]], initial: Relations):
+    from depysible.domain.seminaive import Relation
+
+    connection.send([rule for plan in plans for rule in plan.evaluate(full, initial, 0)])
+    task: Round = connection.recv()
+    while task is not None:
+        literals, partition = task
+        for literal in literals:
+            full.setdefault(literal.predicate, Relation()).add(literal)
+
+        delta: Relations = {}
+        for i in partition:
+            delta.setdefault(literals[i].predicate, Relation()).add(literals[i])
+
+        connection.send([rule for plan, positions in zip(plans, pivots) for pivot in positions
+                         if plan.steps[pivot].predicate in delta for rule in plan.evaluate(full, delta, pivot)])
+        task = connection.recv()
+
+    connection.close()
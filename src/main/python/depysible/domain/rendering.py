@@ -1,4 +1,3 @@
-import re
 from collections import namedtuple
 from typing import Any
 from typing import Set
@@ -129,6 +128,17 @@ class Renderer:
         else:
             return '%s>%s' % (PUNCTUATION, RESET)
 
+    @staticmethod
+    def operator(symbol: str, blind: bool = False) -> str:
+        from depysible.domain.theme import PUNCTUATION
+        from depysible.domain.theme import RESET
+
+        if blind:
+            return ' %s ' % symbol
+
+        else:
+            return '%s %s %s' % (PUNCTUATION, symbol, RESET)
+
     @staticmethod
     def stop(blind: bool = False) -> str:
         from depysible.domain.theme import PUNCTUATION
@@ -201,8 +211,9 @@ class Renderer:
         from depysible.domain.definitions import Literal
         from depysible.domain.definitions import Rule
         from depysible.domain.definitions import Program
+        from depysible.domain.definitions import Variable
 
-        if type(obj) in [bool, int, float, str]:
+        if type(obj) in [bool, int, float, str, Variable]:
             return cls.render_term(obj, blind)
 
         elif type(obj) is Atom:
@@ -231,6 +242,7 @@ class Renderer:
 
     @classmethod
     def render_term(cls, term: 'Term', blind: bool = False):
+        from depysible.domain.definitions import Variable
         from depysible.domain.theme import MUTE_VARIABLE
         from depysible.domain.theme import RESET
         from depysible.domain.theme import STRING
@@ -244,7 +256,7 @@ class Renderer:
         elif type(term) in [bool, float, int]:
             return '%s%s%s' % (VALUE, term, RESET)
 
-        elif type(term) is str and re.match(r'[_A-Z][a-z_0-9]*', term):
+        elif type(term) is Variable:
             style = MUTE_VARIABLE if term.startswith('_') else VARIABLE
             return '%s%s%s' % (style, term, RESET)
 
@@ -254,10 +266,21 @@ class Renderer:
 
     @classmethod
     def render_atom(cls, atom: 'Atom', blind: bool = False) -> str:
+        from depysible.domain.builtins import ARITHMETIC
+        from depysible.domain.builtins import COMPARISONS
+
+        terms = [cls.render_term(term, blind) for term in atom.terms]
+        if atom.functor in COMPARISONS and len(terms) == 2:
+            return '%s%s%s' % (terms[0], cls.operator(atom.functor, blind), terms[1])
+
+        if atom.functor in ARITHMETIC and len(terms) == 3:
+            return '%s%s%s%s%s' % (terms[0], cls.operator('=', blind), terms[1], cls.operator(atom.functor, blind),
+                                   terms[2])
+
         content = cls.render_functor(atom, blind)
         if atom.terms:
             content += cls.lpar(blind)
-            content += cls.comma(blind).join(cls.render_term(term, blind) for term in atom.terms)
+            content += cls.comma(blind).join(terms)
             content += cls.rpar(blind)
 
         return content
@@ -306,7 +329,9 @@ class Renderer:
 
     @classmethod
     def render_rules(cls, program: 'Program', rules: Set['Rule'], blind: bool = False) -> str:
-        return '\n'.join(cls.render_rule(rule, blind) for rule in sorted(rules))
+        from depysible.domain.definitions import sort_key
+
+        return '\n'.join(cls.render_rule(rule, blind) for rule in sorted(rules, key=sort_key))
 
     @classmethod
     def render_program(cls, program: 'Program', blind: bool = False) -> str:
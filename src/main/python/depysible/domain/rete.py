@@ -1,131 +1,794 @@
+import heapq
+import json
+import pickle
+import time
+from collections import deque
+from itertools import chain
+from itertools import count
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
 from typing import Union
 
-Payload = Tuple[List['Literal'], 'Substitutions']
+Token = Tuple[Tuple['Literal', ...], 'Binding']
+JoinIndex = Dict[Tuple['Term', ...], List[Token]]
+Dispatch = Dict[Tuple[int, ...], Dict[Tuple['Code', ...], List['Alfa']]]
+Statistics = Dict['Predicate', int]
 
+SNAPSHOT = b'depysible-rete'
+SNAPSHOT_VERSION = 1
+SYMBOLIC = (bool, int, float, str)
 
-class Root:
+
+class Memory:
     def __init__(self):
-        self.children = set()
+        self.tokens: Dict[Token, Optional['Rule']] = {}
+        self.indexes: Dict[Tuple[int, ...], JoinIndex] = {}
+
+    def __contains__(self, token: Token) -> bool:
+        return token in self.tokens
+
+    def __iter__(self) -> Iterator[Token]:
+        return iter(self.tokens)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def add(self, token: Token, value: Optional['Rule'] = None) -> bool:
+        if token in self.tokens:
+            return False
+
+        self.tokens[token] = value
+        binding = token[1]
+        for positions, index in self.indexes.items():
+            index.setdefault(tuple([binding[i] for i in positions]), []).append(token)
+
+        return True
+
+    def remove(self, token: Token) -> bool:
+        if token not in self.tokens:
+            return False
+
+        del self.tokens[token]
+        binding = token[1]
+        for positions, index in self.indexes.items():
+            key = tuple([binding[i] for i in positions])
+            bucket = index[key]
+            bucket.remove(token)
+            if not bucket:
+                del index[key]
+
+        return True
+
+    def index(self, positions: Tuple[int, ...]) -> JoinIndex:
+        index = self.indexes.get(positions)
+        if index is None:
+            index = self.indexes[positions] = {}
+            for token in self.tokens:
+                index.setdefault(tuple([token[1][i] for i in positions]), []).append(token)
+
+        return index
+
+
+class Agenda:
+    def __init__(self, sink: Optional[Callable[['Rule'], Any]] = None):
+        self.rules: Dict['Rule', None] = {}
+        self.pending: List['Rule'] = []
+        self.sink = sink
+
+    def __contains__(self, rule: 'Rule') -> bool:
+        return rule in self.rules
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {**self.__dict__, 'sink': None}
+
+    def __iter__(self) -> Iterator['Rule']:
+        return iter(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, rule: 'Rule'):
+        if self.sink is not None:
+            self.sink(rule)
+        elif rule not in self.rules:
+            self.rules[rule] = None
+            self.pending.append(rule)
+
+    def discard(self, rule: 'Rule'):
+        self.rules.pop(rule, None)
+
+    def drain(self) -> List['Rule']:
+        pending, self.pending = self.pending, []
+
+        return pending
+
+
+class JoinPlan:
+    def __init__(self, rule: 'Rule', statistics: Statistics, planned: bool = True):
+        from depysible.domain.builtins import is_builtin
+
+        self.rule = rule
+        default = max(statistics.values(), default=1)
+        cardinalities = [statistics.get(literal.predicate, default) for literal in rule.body]
+
+        bound = set()
+        steps = []
+        remaining = [k for k, literal in enumerate(rule.body) if not is_builtin(literal)]
+        while remaining:
+            estimates = [(self._estimate(rule.body[k], cardinalities[k], bound), k) for k in remaining]
+            if planned:
+                connected = [(estimate, k) for (estimate, free), k in estimates if free < len(rule.body[k].terms)]
+                _, k = min(connected or [(estimate, k) for (estimate, _), k in estimates])
+            else:
+                k = remaining[0]
+            literal = rule.body[k]
+            steps.append((k, literal, cardinalities[k], self._estimate(literal, cardinalities[k], bound)[0]))
+            bound.update(literal.atom.matcher.variables)
+            remaining.remove(k)
+
+        self.steps: Tuple[Tuple[int, 'Literal', int, float], ...] = tuple(steps)
+        self.order = tuple(sorted(range(len(steps)), key=lambda i: steps[i][0]))
+
+    def __iter__(self) -> Iterator['Literal']:
+        return (literal for _, literal, _, _ in self.steps)
+
+    def __str__(self) -> str:
+        lines = [repr(self.rule)]
+        for i, (k, literal, cardinality, estimate) in enumerate(self.steps):
+            lines.append('  %d. %-32s source %d, cardinality %d, estimate %.1f' %
+                         (i + 1, repr(literal), k + 1, cardinality, estimate))
+
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _estimate(literal: 'Literal', cardinality: int, bound: Set['Variable']) -> Tuple[float, int]:
+        free = sum(1 for term in literal.terms if literal.atom.is_variable(term) and term not in bound)
+        if not literal.terms:
+            return 1.0, 0
+
+        return float(cardinality) ** (free / len(literal.terms)), free
+
+
+class Root:
+    def __init__(self, salience: bool = False):
+        self.children: Dict['Predicate', Dispatch] = {}
+        self.literals: Dict['Predicate', Dict['Literal', None]] = {}
+        self.asserted: Dict['Literal', int] = {}
+        self.produced: Dict['Rule', int] = {}
+        self.support: Dict['Literal', int] = {}
+        self.retractions = deque()
+        self.withdrawn: Dict['Rule', None] = {}
+        self.salience = salience
+        self.queue = [] if salience else deque()
+        self.sequence = count()
+        self.activations = 0
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        sequence = next(self.sequence)
+        self.sequence = count(sequence)
+
+        return {**self.__dict__, 'children': {}, 'sequence': sequence}
 
-    def notify(self, ground: 'Literal'):
-        for child in self.children:
-            child.notify(ground, {}, self)
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state, sequence=count(state['sequence']))
+
+    def add(self, alfa: 'Alfa'):
+        positions = tuple(i for i, _ in alfa.matcher.constants)
+        codes = tuple(code for _, code in alfa.matcher.constants)
+        dispatch = self.children.setdefault(alfa.pattern.predicate, {})
+        dispatch.setdefault(positions, {}).setdefault(codes, []).append(alfa)
+
+    def notify(self, ground: 'Literal', salience: int = 0):
+        if self.salience:
+            heapq.heappush(self.queue, (-salience, next(self.sequence), ground))
+        else:
+            self.queue.append(ground)
+
+    def notify_all(self, grounds: Iterable['Literal']):
+        for ground in grounds:
+            self.notify(ground)
+
+    def assert_literal(self, ground: 'Literal'):
+        self.asserted[ground] = self.asserted.get(ground, 0) + 1
+        self.notify(ground)
+
+    def produce(self, rule: 'Rule', agenda: Agenda, salience: int = 0):
+        if agenda.sink is not None:
+            agenda.add(rule)
+            self.notify(rule.head, salience)
+            return
+
+        count = self.produced.get(rule, 0)
+        self.produced[rule] = count + 1
+        if not count:
+            agenda.add(rule)
+            self.support[rule.head] = self.support.get(rule.head, 0) + 1
+        self.notify(rule.head, salience)
+
+    def withdraw(self, rule: 'Rule'):
+        count = self.produced[rule] - 1
+        if count:
+            self.produced[rule] = count
+        else:
+            del self.produced[rule]
+            self.withdrawn[rule] = None
+            support = self.support[rule.head] - 1
+            if support:
+                self.support[rule.head] = support
+            else:
+                del self.support[rule.head]
+        self.retractions.append(rule.head)
+
+    def retract(self, ground: 'Literal') -> Tuple[List['Literal'], List['Rule']]:
+        deleted = []
+        self.withdrawn = {}
+        self.retractions.append(ground)
+        while self.retractions:
+            ground = self.retractions.popleft()
+            literals = self.literals.get(ground.predicate)
+            if literals is None or ground not in literals:
+                continue
+
+            del literals[ground]
+            deleted.append(ground)
+            for child in self.match(ground):
+                child.retract(ground)
+
+        return deleted, list(self.withdrawn)
+
+    def run(self, limit: Optional[int] = None) -> int:
+        processed = 0
+        while self.queue and (limit is None or processed < limit):
+            if self.salience:
+                ground = heapq.heappop(self.queue)[2]
+            else:
+                ground = self.queue.popleft()
+            self.dispatch(ground)
+            processed += 1
+
+        self.activations += processed
+        return processed
+
+    def dispatch(self, ground: 'Literal'):
+        literals = self.literals.setdefault(ground.predicate, {})
+        if ground in literals:
+            return
+
+        literals[ground] = None
+        for child in self.match(ground):
+            child.notify(ground, (), self)
+
+    def match(self, ground: 'Literal') -> Iterator['Alfa']:
+        dispatch = self.children.get(ground.predicate)
+        if dispatch is None:
+            return
+
+        codes = ground.atom.codes
+        for positions, alfas in dispatch.items():
+            yield from alfas.get(tuple([codes[i] for i in positions]), ())
 
 
 class Alfa:
     def __init__(self, pattern: 'Literal', parent: Root):
         self.parent = parent
         self.pattern = pattern
+        self.matcher = pattern.atom.matcher
+        self.variables = self.matcher.variables
         self.name = repr(pattern)
-        self.memory = []
-        self.children = set()
-        parent.children.add(self)
-
-    def notify(self, ground: 'Literal', subs: 'Substitutions', parent: Root):
-        subs = self.pattern.unifies(ground)
-        if subs is not None:
-            payload = ([ground], subs)
-            if payload not in self.memory:
-                self.memory.append(payload)
+        self.memory = Memory()
+        self.children = []
+        parent.add(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {key: value for key, value in self.__dict__.items() if key != 'matcher'}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state, matcher=state['pattern'].atom.matcher)
+
+    def notify(self, ground: 'Literal', binding: 'Binding', parent: Root):
+        binding = self.matcher.match(ground.atom)
+        if binding is not None:
+            token = ((ground,), binding)
+            if self.memory.add(token):
                 for child in self.children:
-                    child.notify([ground], subs, self)
+                    child.notify(token[0], binding, self)
+
+    def retract(self, ground: 'Literal'):
+        binding = self.matcher.match(ground.atom)
+        token = ((ground,), binding)
+        if binding is not None and token in self.memory:
+            for child in self.children:
+                child.retract(token[0], binding, self)
+            self.memory.remove(token)
+
+    def replay(self):
+        for ground in list(self.parent.literals.get(self.pattern.predicate, ())):
+            self.notify(ground, (), self.parent)
 
 
 class Beta:
-    def __init__(self, parent_1: Union[Alfa, 'Beta'], parent_2: Alfa):
+    def __init__(self, parent_1: Union[Alfa, 'Beta', 'Filter'], parent_2: Alfa, pattern: Optional['Literal'] = None):
+        pattern = pattern or parent_2.pattern
         self.parent_1 = parent_1
         self.parent_2 = parent_2
-        self.name = '%s, %s' % (parent_1.name, parent_2.name)
-        self.memory = []
-        self.children = set()
-        parent_1.children.add(self)
-        parent_2.children.add(self)
+        self.name = '%s, %r' % (parent_1.name, pattern)
+        self.memory = Memory()
+        self.children = []
+        parent_1.children.append(self)
+        if parent_2 is not parent_1:
+            parent_2.children.append(self)
 
-    def notify(self, ground: List['Literal'], subs: 'Substitutions', parent: Union[Alfa, 'Beta']):
-        if parent is self.parent_1:
-            for ground_2, subs_2 in self.parent_2.memory:
-                self._notify(ground, subs, ground_2, subs_2)
-        elif parent is self.parent_2:
-            for ground_1, subs_1 in self.parent_1.memory:
-                self._notify(ground_1, subs_1, ground, subs)
+        variables = pattern.atom.matcher.variables
+        self.shared = tuple((parent_1.variables.index(var), j) for j, var in enumerate(variables)
+                            if var in parent_1.variables)
+        self.extra = tuple(j for j, var in enumerate(variables) if var not in parent_1.variables)
+        self.variables = (*parent_1.variables, *(variables[j] for j in self.extra))
 
-    @staticmethod
-    def _unifies(subs_1: 'Substitutions', subs_2: 'Substitutions') -> Optional['Substitutions']:
-        for var in set(subs_1).intersection(subs_2):
-            if subs_1[var] != subs_2[var]:
-                return None
-
-        return {**subs_1, **subs_2}
-
-    def _notify(self, ground_1: List['Literal'], subs_1: 'Substitutions', ground_2: List['Literal'],
-                subs_2: 'Substitutions'):
-        subs = self._unifies(subs_1, subs_2)
-        if subs is not None:
-            ground = [*ground_1, *ground_2]
-            payload = (ground, subs)
-            if payload not in self.memory:
-                self.memory.append(payload)
+        self.keys_1 = tuple(i for i, _ in self.shared)
+        self.keys_2 = tuple(j for _, j in self.shared)
+        self.index_1 = parent_1.memory.index(self.keys_1)
+        self.index_2 = parent_2.memory.index(self.keys_2)
+
+    def notify(self, ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Alfa, 'Beta']):
+        for token in self._join(ground, binding, parent):
+            if self.memory.add(token):
+                for child in self.children:
+                    child.notify(token[0], token[1], self)
+
+    def retract(self, ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Alfa, 'Beta']):
+        for token in list(self._join(ground, binding, parent)):
+            if token in self.memory:
                 for child in self.children:
-                    child.notify(ground, subs, self)
+                    child.retract(token[0], token[1], self)
+                self.memory.remove(token)
+
+    def replay(self):
+        for ground, binding in list(self.parent_1.memory):
+            self.notify(ground, binding, self.parent_1)
+
+    def _join(self, ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Alfa, 'Beta']) -> Iterator[Token]:
+        if parent is self.parent_1:
+            for ground_2, binding_2 in self.index_2.get(tuple([binding[i] for i in self.keys_1]), ()):
+                if self._matches(binding, binding_2):
+                    yield (*ground, *ground_2), (*binding, *(binding_2[j] for j in self.extra))
+        if parent is self.parent_2:
+            for ground_1, binding_1 in self.index_1.get(tuple([binding[j] for j in self.keys_2]), ()):
+                if self._matches(binding_1, binding):
+                    yield (*ground_1, *ground), (*binding_1, *(binding[j] for j in self.extra))
+
+    def _matches(self, binding_1: 'Binding', binding_2: 'Binding') -> bool:
+        for i, j in self.shared:
+            if binding_1[i] is not binding_2[j]:
+                return False
+
+        return True
+
+
+class Filter:
+    def __init__(self, parent: Union[Alfa, Beta, 'Filter'], builtin: 'Builtin'):
+        self.parent = parent
+        self.builtin = builtin
+        self.name = '%s, %r' % (parent.name, builtin)
+        self.memory = Memory()
+        self.children = []
+        parent.children.append(self)
+
+        self.arguments = tuple((parent.variables.index(term), None) if builtin.literal.atom.is_variable(term)
+                               else (None, term) for term in builtin.inputs)
+        self.variables = parent.variables
+
+    def notify(self, ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Alfa, Beta, 'Filter']):
+        token = self._apply(ground, binding)
+        if token is not None and self.memory.add(token):
+            for child in self.children:
+                child.notify(token[0], token[1], self)
+
+    def retract(self, ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Alfa, Beta, 'Filter']):
+        token = self._apply(ground, binding)
+        if token is not None and token in self.memory:
+            for child in self.children:
+                child.retract(token[0], token[1], self)
+            self.memory.remove(token)
+
+    def replay(self):
+        for ground, binding in list(self.parent.memory):
+            self.notify(ground, binding, self.parent)
+
+    def _apply(self, ground: Tuple['Literal', ...], binding: 'Binding') -> Optional[Token]:
+        result = self.builtin.evaluate([binding[i] if i is not None else value for i, value in self.arguments])
+        if result is None:
+            return None
+
+        return ground, (*binding, *result) if result else binding
+
+
+class Compute(Filter):
+    def __init__(self, parent: Union[Alfa, Beta, Filter], builtin: 'Builtin'):
+        super().__init__(parent, builtin)
+        self.variables = (*parent.variables, builtin.target)
 
 
 class Leaf:
-    def __init__(self, rule: 'Rule', parent: Union[Alfa, Beta], root: Root, agenda: List):
+    def __init__(self, rule: 'Rule', parent: Union[Alfa, Beta, Filter], root: Root, agenda: Agenda,
+                 order: Optional[Tuple[int, ...]] = None, variables: Optional[Tuple['Variable', ...]] = None):
         self.parent = parent
         self.rule = rule
+        self.variables = variables or parent.variables
+        self.order = order if order != tuple(range(len(order or ()))) else None
         self.name = repr(rule)
-        self.memory = []
+        self.memory = Memory()
 
         self.root = root
         self.agenda = agenda
-        parent.children.add(self)
+        parent.children.append(self)
 
-    def notify(self, ground: List['Literal'], subs: 'Substitutions', parent: Union[Alfa, 'Beta']):
+    def notify(self, ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Alfa, 'Beta']):
         from depysible.domain.definitions import Rule
 
-        payload = (ground, subs)
-        if payload not in self.memory:
-            self.memory.append(payload)
-
-            lit = self.rule.head.substitutes(subs)
+        token = (ground, binding)
+        if token not in self.memory:
+            lit = self.rule.head.substitutes(dict(zip(self.variables, binding)))
             # if self.rule.type is RuleType.STRICT:
             #     fact = Rule(lit, self.rule.type, [])
             #     if fact not in self.agenda:
             #         self.agenda.append(fact)
 
-            rule = Rule(lit, self.rule.type, ground)
-            if rule not in self.agenda:
-                self.agenda.append(rule)
+            body = ground if self.order is None else tuple([ground[i] for i in self.order])
+            rule = Rule(lit, self.rule.type, body)
+            self.memory.add(token, rule if self.agenda.sink is None else None)
+            self.root.produce(rule, self.agenda, self.rule.salience)
 
-            self.root.notify(lit)
+    def retract(self, ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Alfa, 'Beta']):
+        token = (ground, binding)
+        rule = self.memory.tokens.get(token)
+        if rule is not None:
+            self.memory.remove(token)
+            self.root.withdraw(rule)
 
+    def replay(self):
+        for ground, binding in list(self.parent.memory):
+            self.notify(ground, binding, self.parent)
 
-def fire_rules(program: 'Program') -> List['Rule']:
-    if program.is_ground():
-        return program
-
-    rules = []
-    table = {}
-    root = Root()
-    for rule in program.rules:
-        if rule.is_fact():
-            rules.append(rule)
-        else:
-            beta = None
-            for lit in rule.body:
-                name = repr(lit)
-                alfa = table.setdefault(name, Alfa(lit, root))
+
+class Counters:
+    __slots__ = ('activations', 'matches', 'seconds')
+
+    def __init__(self):
+        self.activations = 0
+        self.matches = 0
+        self.seconds = 0.0
+
+
+class SnapshotPickler(pickle.Pickler):
+    def persistent_id(self, obj: Any) -> Optional['Term']:
+        from depysible.domain.symbols import SYMBOLS
+
+        if isinstance(obj, SYMBOLIC) and obj in SYMBOLS and SYMBOLS.decode(SYMBOLS.encode(obj)) is obj:
+            return obj
+
+        return None
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: 'Term') -> 'Term':
+        from depysible.domain.symbols import SYMBOLS
+
+        return SYMBOLS.decode(SYMBOLS.encode(pid))
+
+
+def instrument(node: Union[Alfa, Beta, Filter, Leaf]) -> Counters:
+    counters = Counters()
+    notify = node.notify
+    memory = node.memory
+
+    def instrumented(ground: Tuple['Literal', ...], binding: 'Binding', parent: Union[Root, Alfa, Beta, Filter]):
+        counters.activations += 1
+        size = len(memory)
+        start = time.perf_counter()
+        notify(ground, binding, parent)
+        counters.seconds += time.perf_counter() - start
+        counters.matches += len(memory) - size
+
+    node.notify = instrumented
+
+    return counters
+
+
+class ReteNetwork:
+    def __init__(self, salience: bool = False, planned: bool = True, sink: Optional[Callable[['Rule'], Any]] = None,
+                 instrumented: bool = False):
+        self.root = Root(salience)
+        self.planned = planned
+        self.table: Dict[str, Union[Alfa, Beta, Filter]] = {}
+        self.leaves: Dict['Rule', Leaf] = {}
+        self.plans: Dict['Rule', JoinPlan] = {}
+        self.agenda = Agenda(sink)
+        self.counters: Optional[Dict[Union[Alfa, Beta, Filter, Leaf], Counters]] = {} if instrumented else None
+        self.seconds = 0.0
+        if instrumented:
+            run = self.root.run
+
+            def timed(limit: Optional[int] = None) -> int:
+                start = time.perf_counter()
+                processed = run(limit)
+                self.seconds += time.perf_counter() - start
+                return processed
+
+            self.root.run = timed
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        for node in self.table.values():
+            if isinstance(node, Alfa):
+                self.root.add(node)
+
+    def add_program(self, program: 'Program') -> List['Rule']:
+        self._load(program)
+        self.root.run()
+
+        return self.agenda.drain()
+
+    def stream(self, program: 'Program', batch: int = 1024) -> Iterator['Rule']:
+        self._load(program)
+        while self.root.run(batch):
+            yield from self.agenda.drain()
+        yield from self.agenda.drain()
+
+    def add_fact(self, literal: 'Literal') -> List['Rule']:
+        self.root.assert_literal(literal)
+        self.root.run()
+
+        return self.agenda.drain()
+
+    def add_rule(self, rule: 'Rule') -> List['Rule']:
+        if not rule.body:
+            return self.add_fact(rule.head)
+
+        self._compile(rule, self.statistics())
+        self.root.run()
+
+        return self.agenda.drain()
+
+    def add_rules(self, rules: Iterable['Rule']) -> List['Rule']:
+        statistics = self.statistics()
+        for rule in rules:
+            if rule.body:
+                self._compile(rule, statistics)
+            else:
+                self.root.assert_literal(rule.head)
+        self.root.run()
+
+        return self.agenda.drain()
+
+    def retract(self, literal: 'Literal') -> List['Rule']:
+        if self.agenda.sink is not None:
+            raise ValueError('Cannot retract from a network that passes its rules to a sink')
+
+        root = self.root
+        count = root.asserted.get(literal, 0)
+        if count != 1:
+            if count:
+                root.asserted[literal] = count - 1
+            return []
+
+        del root.asserted[literal]
+        deleted, withdrawn = root.retract(literal)
+        for ground in deleted:
+            if ground in root.asserted or ground in root.support:
+                root.notify(ground)
+        root.run()
+
+        self.agenda.drain()
+        withdrawn = [rule for rule in withdrawn if rule not in root.produced]
+        for rule in withdrawn:
+            self.agenda.discard(rule)
+
+        return withdrawn
+
+    def statistics(self) -> Statistics:
+        return {predicate: len(literals) for predicate, literals in self.root.literals.items() if literals}
+
+    def explain(self, rule: 'Rule') -> str:
+        plan = self.plans.get(rule) or JoinPlan(rule, self.statistics(), self.planned)
+
+        return str(plan)
+
+    def save(self, file: BinaryIO, fingerprint: str = ''):
+        if self.counters is not None:
+            raise ValueError('Cannot snapshot an instrumented network')
+
+        file.write(b'%s %d %s\n' % (SNAPSHOT, SNAPSHOT_VERSION, fingerprint.encode('ascii')))
+        SnapshotPickler(file, pickle.HIGHEST_PROTOCOL).dump(self)
+
+    @staticmethod
+    def load(file: BinaryIO, fingerprint: Optional[str] = None) -> 'ReteNetwork':
+        header = file.readline().split()
+        if len(header) not in (2, 3) or header[0] != SNAPSHOT:
+            raise ValueError('Not a network snapshot')
+
+        if int(header[1]) != SNAPSHOT_VERSION:
+            raise ValueError('Unsupported snapshot version: %s' % header[1].decode('ascii'))
+
+        if fingerprint is not None and (header[2:] or [b''])[0].decode('ascii') != fingerprint:
+            raise ValueError('Snapshot was taken from a different program')
+
+        return SnapshotUnpickler(file).load()
+
+    def profile(self) -> Dict[str, Any]:
+        if self.counters is None:
+            raise ValueError('The network is not instrumented')
+
+        ids = {node: i for i, node in enumerate(self.counters)}
+        nodes = []
+        for node, counters in self.counters.items():
+            if isinstance(node, Leaf):
+                kind, parents = 'leaf', [node.parent]
+            elif isinstance(node, Beta):
+                kind, parents = 'beta', [node.parent_1, node.parent_2]
+            elif isinstance(node, Filter):
+                kind, parents = 'compute' if isinstance(node, Compute) else 'filter', [node.parent]
+            else:
+                kind, parents = 'alfa', []
+            entry = {
+                'id': ids[node],
+                'type': kind,
+                'name': node.name,
+                'parents': [ids[parent] for parent in parents],
+                'activations': counters.activations,
+                'matches': counters.matches,
+                'memory': len(node.memory),
+                'seconds': counters.seconds,
+            }
+            if isinstance(node, Beta):
+                pairs = len(node.parent_1.memory) * len(node.parent_2.memory)
+                entry['selectivity'] = len(node.memory) / pairs if pairs else 0.0
+            nodes.append(entry)
+
+        root = {'activations': self.root.activations, 'literals': sum(map(len, self.root.literals.values())),
+                'seconds': self.seconds}
+
+        return {'root': root, 'nodes': nodes}
+
+    def profile_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.profile(), indent=indent)
+
+    def profile_tree(self) -> str:
+        profile = self.profile()
+        nodes = profile['nodes']
+        children = {}
+        for entry in nodes:
+            if entry['parents']:
+                children.setdefault(entry['parents'][0], []).append(entry)
+
+        root = profile['root']
+        lines = ['root  activations=%d literals=%d time=%.6fs' % (
+            root['activations'], root['literals'], root['seconds'])]
+
+        def visit(entry: Dict[str, Any], depth: int):
+            extra = ''
+            if entry['type'] == 'beta':
+                extra = ' joins=#%d selectivity=%.6f' % (entry['parents'][1], entry['selectivity'])
+            lines.append('%s#%d %s %s  activations=%d matches=%d memory=%d time=%.6fs%s' % (
+                '  ' * depth, entry['id'], entry['type'], entry['name'], entry['activations'], entry['matches'],
+                entry['memory'], entry['seconds'], extra))
+            for child in children.get(entry['id'], ()):
+                visit(child, depth + 1)
+
+        for entry in nodes:
+            if entry['type'] == 'alfa':
+                visit(entry, 1)
+
+        return '\n'.join(lines)
+
+    def _load(self, program: 'Program'):
+        statistics = self.statistics()
+        for literal in chain(program.get_facts().heads(), program.get_presumptions().heads()):
+            self.root.assert_literal(literal)
+            statistics[literal.predicate] = statistics.get(literal.predicate, 0) + 1
+        for rule in program.get_rules():
+            self._compile(rule, statistics)
+
+    def _compile(self, rule: 'Rule', statistics: Statistics):
+        from depysible.domain.builtins import Builtin
+        from depysible.domain.builtins import arrange
+        from depysible.domain.builtins import is_builtin
+        from depysible.domain.definitions import Variable
+
+        if rule in self.leaves:
+            return
+
+        plan = JoinPlan(rule, statistics, self.planned)
+        steps = arrange(plan, [lit for lit in rule.body if is_builtin(lit)])
+        self.plans[rule] = plan
+        names = canonical(plan)
+        node = None
+        for lit, builtin in steps:
+            if builtin is not None:
+                for variable in lit.atom.matcher.variables:
+                    names.setdefault(variable, Variable('V%d' % len(names)))
+                builtin = Builtin(lit.substitutes(names), node.variables)
+                name = '%s, %r' % (node.name, builtin)
+                test = self.table.get(name)
+                if test is None:
+                    test = self.table[name] = (Filter if builtin.target is None else Compute)(node, builtin)
+                    self._instrument(test)
+                    test.replay()
+                node = test
+                continue
+
+            pattern = lit.substitutes(names)
+            local = lit.substitutes(canonical([lit]))
+            name = repr(local)
+            alfa = self.table.get(name)
+            if alfa is None:
+                alfa = self.table[name] = Alfa(local, self.root)
+                self._instrument(alfa)
+                alfa.replay()
+            if node is None:
+                node = alfa
+            else:
+                name = '%s, %r' % (node.name, pattern)
+                beta = self.table.get(name)
                 if beta is None:
-                    beta = alfa
-                else:
-                    name = '%s, %s' % (beta.name, alfa.name)
-                    beta = table.setdefault(name, Beta(beta, alfa))
-            Leaf(rule, beta, root, rules)
+                    beta = self.table[name] = Beta(node, alfa, pattern)
+                    self._instrument(beta)
+                    beta.replay()
+                node = beta
+
+        variables = {name: variable for variable, name in names.items()}
+        leaf = self.leaves[rule] = Leaf(rule, node, self.root, self.agenda, plan.order,
+                                        tuple(variables[name] for name in node.variables))
+        self._instrument(leaf)
+        leaf.replay()
+
+    def _instrument(self, node: Union[Alfa, Beta, Filter, Leaf]):
+        if self.counters is not None:
+            self.counters[node] = instrument(node)
+
+
+def canonical(literals: Iterable['Literal']) -> Dict['Variable', 'Variable']:
+    from depysible.domain.definitions import Variable
+
+    names = {}
+    for literal in literals:
+        for variable in literal.atom.matcher.variables:
+            if variable not in names:
+                names[variable] = Variable('V%d' % len(names))
+
+    return names
+
+
+def fire_rules(program: 'Program', salience: bool = False) -> List['Rule']:
+    if program.is_ground():
+        return list(program.rules)
+
+    return [*program.get_facts(), *program.get_presumptions(), *derive_rules(program, salience)]
+
+
+def stream_rules(program: 'Program', salience: bool = False) -> Iterator['Rule']:
+    if program.is_ground():
+        yield from program.rules
+        return
+
+    yield from chain(program.get_facts(), program.get_presumptions())
+    rules = deque()
+    network = ReteNetwork(salience, sink=rules.append)
+    network._load(program)
+    while network.root.run(1024) or rules:
+        while rules:
+            yield rules.popleft()
 
-    for fact in program.get_facts():
-        root.notify(fact.head)
 
-    return rules
+def derive_rules(program: 'Program', salience: bool = False) -> List['Rule']:
+    return ReteNetwork(salience).add_program(program)
@@ -0,0 +1,325 @@
+from itertools import chain
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+Key = Tuple['Code', ...]
+Codes = Dict['Variable', 'Code']
+
+
+class Relation:
+    def __init__(self):
+        self.literals: Dict['Literal', None] = {}
+        self.indexes: Dict[Tuple[int, ...], Dict[Key, List['Literal']]] = {}
+
+    def __contains__(self, literal: 'Literal') -> bool:
+        return literal in self.literals
+
+    def __iter__(self) -> Iterator['Literal']:
+        return iter(self.literals)
+
+    def __len__(self) -> int:
+        return len(self.literals)
+
+    def add(self, literal: 'Literal') -> bool:
+        if literal in self.literals:
+            return False
+
+        self.literals[literal] = None
+        codes = literal.atom.codes
+        for positions, index in self.indexes.items():
+            index.setdefault(tuple([codes[i] for i in positions]), []).append(literal)
+
+        return True
+
+    def lookup(self, positions: Tuple[int, ...], key: Key) -> Iterable['Literal']:
+        if not positions:
+            return self.literals
+
+        index = self.indexes.get(positions)
+        if index is None:
+            index = self.indexes[positions] = {}
+            for literal in self.literals:
+                codes = literal.atom.codes
+                index.setdefault(tuple([codes[i] for i in positions]), []).append(literal)
+
+        return index.get(key, ())
+
+
+class TableRelation(Relation):
+    def __init__(self, table: 'FactTable'):
+        super().__init__()
+        self.table = table
+        self.rows: Dict[Tuple[int, ...], Dict[Key, List[int]]] = {}
+
+    def __contains__(self, literal: 'Literal') -> bool:
+        return literal in self.literals or self.table.contains(literal)
+
+    def __iter__(self) -> Iterator['Literal']:
+        return chain(self.table.heads(), self.literals)
+
+    def __len__(self) -> int:
+        return len(self.table) + len(self.literals)
+
+    def add(self, literal: 'Literal') -> bool:
+        if self.table.contains(literal):
+            return False
+
+        return super().add(literal)
+
+    def lookup(self, positions: Tuple[int, ...], key: Key) -> Iterable['Literal']:
+        from depysible.domain.definitions import Atom
+        from depysible.domain.definitions import Literal
+
+        if not positions:
+            return list(self)
+
+        index = self.rows.get(positions)
+        if index is None:
+            index = self.rows[positions] = {}
+            for i, row in enumerate(self.table.rows()):
+                index.setdefault(tuple([row[j - 1] for j in positions]), []).append(i)
+
+        table = self.table
+        found = [Literal(table.negated, Atom.from_codes((table.code, *table.row(i)))) for i in index.get(key, ())]
+        if self.literals:
+            found.extend(super().lookup(positions, key))
+
+        return found
+
+
+class Step:
+    def __init__(self, pattern: 'Literal', bound: Set['Variable']):
+        matcher = pattern.atom.matcher
+        self.pattern = pattern
+        self.predicate = pattern.predicate
+
+        positions, lookups, outputs, repeats = [], [], [], []
+        for i, code in matcher.constants:
+            positions.append(i)
+            lookups.append((None, code))
+        seen = {}
+        for i, term in enumerate(pattern.terms):
+            if pattern.atom.is_variable(term):
+                if term in bound:
+                    positions.append(i + 1)
+                    lookups.append((term, None))
+                elif term in seen:
+                    repeats.append((i + 1, seen[term]))
+                else:
+                    seen[term] = i + 1
+                    outputs.append((term, i + 1))
+
+        self.positions = tuple(positions)
+        self.lookups = tuple(lookups)
+        self.outputs = tuple(outputs)
+        self.repeats = tuple(repeats)
+        bound.update(variable for variable, _ in outputs)
+
+    def key(self, codes: Codes) -> Key:
+        return tuple([codes[variable] if variable is not None else code for variable, code in self.lookups])
+
+    def extend(self, literal: 'Literal', codes: Codes) -> Optional[Codes]:
+        values = literal.atom.codes
+        for i, j in self.repeats:
+            if values[i] != values[j]:
+                return None
+
+        if not self.outputs:
+            return codes
+
+        codes = dict(codes)
+        for variable, i in self.outputs:
+            codes[variable] = values[i]
+
+        return codes
+
+
+class Test:
+    def __init__(self, builtin: 'Builtin', bound: Set['Variable']):
+        self.builtin = builtin
+        self.predicate = builtin.literal.predicate
+        self.lookups = tuple((term, None) if builtin.literal.atom.is_variable(term) else (None, term)
+                             for term in builtin.inputs)
+        if builtin.target is not None:
+            bound.add(builtin.target)
+
+    def extend(self, codes: Codes) -> Optional[Codes]:
+        from depysible.domain.symbols import SYMBOLS
+
+        result = self.builtin.evaluate([SYMBOLS.decode(codes[variable]) if variable is not None else value
+                                        for variable, value in self.lookups])
+        if not result:
+            return None if result is None else codes
+
+        codes = dict(codes)
+        codes[self.builtin.target] = SYMBOLS.encode(result[0])
+
+        return codes
+
+
+class Plan:
+    def __init__(self, rule: 'Rule', source: Optional['Rule'] = None):
+        from depysible.domain.builtins import arrange
+        from depysible.domain.builtins import is_builtin
+        from depysible.domain.definitions import ANONYMOUS
+        from depysible.domain.symbols import SYMBOLS
+
+        self.rule = rule
+        self.source = source or rule
+        self.guards = len(rule.body) - len(self.source.body)
+        bound = set()
+        literals = [literal for literal in rule.body if not is_builtin(literal)]
+        builtins = [literal for literal in rule.body if is_builtin(literal)]
+        self.steps = tuple(Step(literal, bound) if builtin is None else Test(builtin, bound)
+                           for literal, builtin in arrange(literals, builtins))
+
+        head = rule.head.atom
+        anonymous = SYMBOLS.encode(ANONYMOUS)
+        self.functor = head.codes[0]
+        self.head = tuple((term, anonymous) if head.is_variable(term) else (None, code)
+                          for term, code in zip(head.terms, head.codes[1:]))
+
+    def ground(self, codes: Codes, body: Tuple['Literal', ...]) -> 'Rule':
+        from depysible.domain.definitions import Atom
+        from depysible.domain.definitions import Literal
+        from depysible.domain.definitions import Rule
+
+        atom = Atom.from_codes((self.functor, *(codes.get(variable, code) for variable, code in self.head)))
+        return Rule(Literal(self.rule.head.negated, atom), self.source.type, body[self.guards:])
+
+    def evaluate(self, full: Dict['Predicate', Relation], delta: Optional[Dict['Predicate', Relation]],
+                 pivot: Optional[int] = None) -> Iterator['Rule']:
+        partials = [({}, ())]
+        for k, step in enumerate(self.steps):
+            if isinstance(step, Test):
+                partials = [(joined, body) for codes, body in partials for joined in [step.extend(codes)]
+                            if joined is not None]
+                if not partials:
+                    return
+                continue
+
+            relations = delta if k == pivot else full
+            relation = relations.get(step.predicate)
+            if relation is None:
+                return
+
+            extended = []
+            for codes, body in partials:
+                for literal in relation.lookup(step.positions, step.key(codes)):
+                    joined = step.extend(literal, codes)
+                    if joined is not None:
+                        extended.append((joined, (*body, literal)))
+            if not extended:
+                return
+            partials = extended
+
+        for codes, body in partials:
+            yield self.ground(codes, body)
+
+
+def stratify(rules: Iterable['Rule']) -> List[List['Rule']]:
+    graph: Dict['Predicate', Set['Predicate']] = {}
+    for rule in rules:
+        graph.setdefault(rule.head.predicate, set())
+        for literal in rule.body:
+            graph.setdefault(literal.predicate, set())
+            graph[rule.head.predicate].add(literal.predicate)
+
+    components = strongly_connected(graph)
+    strata = {predicate: i for i, component in enumerate(components) for predicate in component}
+    grouped: List[List['Rule']] = [[] for _ in components]
+    for rule in rules:
+        grouped[strata[rule.head.predicate]].append(rule)
+
+    return [stratum for stratum in grouped if stratum]
+
+
+def strongly_connected(graph: Dict['Predicate', Set['Predicate']]) -> List[List['Predicate']]:
+    index, lowlink, stack, on_stack = {}, {}, [], set()
+    components = []
+    for start in graph:
+        if start in index:
+            continue
+
+        work = [(start, iter(graph[start]))]
+        index[start] = lowlink[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[node])
+                if lowlink[node] == index[node]:
+                    components.append(_pop_component(stack, on_stack, node))
+
+    return components
+
+
+def _pop_component(stack: List['Predicate'], on_stack: Set['Predicate'], node: 'Predicate') -> List['Predicate']:
+    component = []
+    while True:
+        member = stack.pop()
+        on_stack.discard(member)
+        component.append(member)
+        if member == node:
+            return component
+
+
+def derive_rules(program: 'Program') -> List['Rule']:
+    full: Dict['Predicate', Relation] = {}
+    for literal in chain(program.get_facts().heads(), program.get_presumptions().heads()):
+        full.setdefault(literal.predicate, Relation()).add(literal)
+
+    return evaluate(program.get_rules(), full)
+
+
+def evaluate(rules: Iterable['Rule'], full: Dict['Predicate', Relation],
+             sources: Optional[Dict['Rule', 'Rule']] = None) -> List['Rule']:
+    sources = sources or {}
+    derived: Dict['Rule', None] = {}
+    for stratum in stratify(rules):
+        predicates = {rule.head.predicate for rule in stratum}
+        plans = [Plan(rule, sources.get(rule)) for rule in stratum]
+        pivots = [[k for k, step in enumerate(plan.steps) if step.predicate in predicates] for plan in plans]
+
+        delta: Dict['Predicate', Relation] = {}
+        for plan in plans:
+            for rule in plan.evaluate(full, None):
+                _collect(rule, derived, full, delta)
+
+        while delta:
+            current, delta = delta, {}
+            for plan, positions in zip(plans, pivots):
+                for pivot in positions:
+                    if plan.steps[pivot].predicate in current:
+                        for rule in plan.evaluate(full, current, pivot):
+                            _collect(rule, derived, full, delta)
+
+    return list(derived)
+
+
+def _collect(rule: 'Rule', rules: Dict['Rule', None], full: Dict['Predicate', Relation],
+             delta: Dict['Predicate', Relation]):
+    if rule in rules:
+        return
+
+    rules[rule] = None
+    head = rule.head
+    if full.setdefault(head.predicate, Relation()).add(head):
+        delta.setdefault(head.predicate, Relation()).add(head)
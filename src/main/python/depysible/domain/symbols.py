@@ -0,0 +1,51 @@
+from threading import Lock
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+Code = int
+
+
+# Codes are never reused: a symbol stays in the table after every atom that used it is gone, so a long-lived process
+# that keeps asserting and retracting new constants grows by one entry per distinct symbol. Terms are decoded to one
+# canonical object per code, so comparing terms by identity is the same as comparing their codes.
+class SymbolTable:
+    def __init__(self):
+        self._codes: Dict[type, Dict[Any, Code]] = {}
+        self._symbols: List[Any] = []
+        self._lock = Lock()
+
+    def __contains__(self, symbol: Any) -> bool:
+        return symbol in self._codes.get(type(symbol), ())
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def encode(self, symbol: Any) -> Code:
+        codes = self._codes.get(type(symbol))
+        code = None if codes is None else codes.get(symbol)
+        if code is None:
+            with self._lock:
+                codes = self._codes.setdefault(type(symbol), {})
+                code = codes.get(symbol)
+                if code is None:
+                    code = len(self._symbols)
+                    self._symbols.append(symbol)
+                    codes[symbol] = code
+
+        return code
+
+    def encode_all(self, symbols: Iterable[Any]) -> Tuple[Code, ...]:
+        return tuple(map(self.encode, symbols))
+
+    def decode(self, code: Code) -> Any:
+        return self._symbols[code]
+
+    def decode_all(self, codes: Iterable[Code]) -> List[Any]:
+        symbols = self._symbols
+        return [symbols[code] for code in codes]
+
+
+SYMBOLS = SymbolTable()
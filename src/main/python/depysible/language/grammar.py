@@ -30,7 +30,31 @@ def strict():
 
 
 def literals():
-    return literal, ZeroOrMore(',', literal)
+    return premise, ZeroOrMore(',', premise)
+
+
+def premise():
+    return [builtin, literal]
+
+
+def builtin():
+    return [arithmetic, comparison]
+
+
+def arithmetic():
+    return term, '=', term, operator, term
+
+
+def comparison():
+    return term, comparator, term
+
+
+def comparator():
+    return ['=<', '>=', '\\=', '=', '<', '>']
+
+
+def operator():
+    return ['+', '-', '*', '/']
 
 
 def literal():
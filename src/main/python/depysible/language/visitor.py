@@ -12,6 +12,7 @@ from depysible.domain.definitions import Literal
 from depysible.domain.definitions import Program
 from depysible.domain.definitions import Rule
 from depysible.domain.definitions import RuleType
+from depysible.domain.definitions import Variable
 
 Node = Union[Terminal, NonTerminal]
 
@@ -42,6 +43,24 @@ class DefeasibleVisitor(PTNodeVisitor):
     def visit_literals(self, node: Node, children: List) -> List[Literal]:
         return [child for child in children]
 
+    def visit_premise(self, node: Node, children: List) -> Literal:
+        return children[0]
+
+    def visit_builtin(self, node: Node, children: List) -> Literal:
+        return children[0]
+
+    def visit_arithmetic(self, node: Node, children: List) -> Literal:
+        return Literal(False, Atom(children[2], [children[0], children[1], children[3]]))
+
+    def visit_comparison(self, node: Node, children: List) -> Literal:
+        return Literal(False, Atom(children[1], [children[0], children[2]]))
+
+    def visit_comparator(self, node: Node, children: List) -> str:
+        return node.flat_str()
+
+    def visit_operator(self, node: Node, children: List) -> str:
+        return node.flat_str()
+
     def visit_literal(self, node: Node, children: List) -> Literal:
         try:
             return Literal(children[0], children[1])
@@ -100,5 +119,5 @@ class DefeasibleVisitor(PTNodeVisitor):
     def visit_identifier(self, node: Node, children: List) -> str:
         return str(node.value)
 
-    def visit_variable(self, node: Node, children: List) -> str:
-        return str(node.value)
+    def visit_variable(self, node: Node, children: List) -> Variable:
+        return Variable(node.value)
@@ -0,0 +1,137 @@
+import re
+from unittest import TestCase
+
+from assertpy import assert_that
+
+from depysible.domain.builtins import Builtin
+from depysible.domain.builtins import arrange
+from depysible.domain.builtins import is_builtin
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.definitions import Variable
+from depysible.domain.rendering import Renderer
+from depysible.domain.rete import ReteNetwork
+from depysible.domain.rete import derive_rules
+from depysible.domain import seminaive
+
+NUMBERS = """
+    n(1).
+    n(2).
+    n(3).
+    n(a).
+    gt(X, Y) <- n(X), n(Y), X > Y.
+    succ(X, Y) <- n(X), Y = X + 1, n(Y).
+    half(X, Y) <- n(X), Y = X / 2.
+    other(X, Y) -< n(X), n(Y), X \\= Y, X =< 1.
+"""
+
+
+class TestBuiltin(TestCase):
+    def test_parse_0(self):
+        rule = Rule.parse('p(X, Y) <- q(X), X >= 2, Y = X * 3, Y \\= 9.')
+        assert_that([is_builtin(literal) for literal in rule.body]).is_equal_to([False, True, True, True])
+        assert_that(repr(rule)).is_equal_to('p(X, Y) <- q(X), X >= 2, Y = X * 3, Y \\= 9.')
+        assert_that(Rule.parse(repr(rule))).is_same_as(rule)
+
+    def test_render_0(self):
+        rule = Rule.parse('p(X, Y) <- q(X), X >= a, Y = X * b, Y \\= c.')
+        content = re.sub(r'\x1b\[[0-9;]*m', '', Renderer.render(rule))
+        assert_that(content).is_equal_to(repr(rule))
+        assert_that(Rule.parse(content)).is_same_as(rule)
+
+    def test_parse_1(self):
+        rule = Rule.parse('p <- q, 1 < 2.')
+        assert_that(rule.body[1].predicate).is_equal_to((False, '<', 2))
+        assert_that(rule.is_ground()).is_false()
+
+    def test_evaluate_0(self):
+        builtin = Builtin(Rule.parse('p <- q(X), X =< 2.').body[1], {Variable('X')})
+        assert_that(builtin.target).is_none()
+        assert_that(builtin.evaluate([2, 2])).is_equal_to(())
+        assert_that(builtin.evaluate([3, 2])).is_none()
+        assert_that(builtin.evaluate(['a', 2])).is_none()
+
+    def test_evaluate_1(self):
+        builtin = Builtin(Rule.parse('p <- q(X), Y = X - 1.').body[1], {Variable('X')})
+        assert_that(builtin.target).is_equal_to(Variable('Y'))
+        assert_that(builtin.evaluate([3, 1])).is_equal_to((2,))
+        assert_that(builtin.evaluate(['a', 1])).is_none()
+
+    def test_evaluate_2(self):
+        builtin = Builtin(Rule.parse('p <- q(X, Y), Y = X / 0.').body[1], {Variable('X'), Variable('Y')})
+        assert_that(builtin.target).is_none()
+        assert_that(builtin.evaluate([1, 1, 0])).is_none()
+
+    def test_arrange_0(self):
+        rule = Rule.parse('p(X) <- X > Y, q(X), r(Y).')
+        arranged = [literal for literal, _ in arrange(rule.body[1:], rule.body[:1])]
+        assert_that(arranged).is_equal_to([rule.body[1], rule.body[2], rule.body[0]])
+
+    def test_arrange_1(self):
+        rule = Rule.parse('p(X) <- q(X), X > Y.')
+        assert_that(arrange).raises(ValueError).when_called_with(rule.body[:1], rule.body[1:])
+
+
+class TestBuiltinGrounding(TestCase):
+    def setUp(self):
+        self.program = Program.parse(NUMBERS)
+
+    def test_derive_rules_0(self):
+        rules = derive_rules(self.program)
+        assert_that(rules).contains_only(
+            Rule.parse('gt(2, 1) <- n(2), n(1).'),
+            Rule.parse('gt(3, 1) <- n(3), n(1).'),
+            Rule.parse('gt(3, 2) <- n(3), n(2).'),
+            Rule.parse('succ(1, 2) <- n(1), n(2).'),
+            Rule.parse('succ(2, 3) <- n(2), n(3).'),
+            Rule.parse('half(1, 0.5) <- n(1).'),
+            Rule.parse('half(2, 1.0) <- n(2).'),
+            Rule.parse('half(3, 1.5) <- n(3).'),
+            Rule.parse('other(1, 2) -< n(1), n(2).'),
+            Rule.parse('other(1, 3) -< n(1), n(3).'),
+            Rule.parse('other(1, a) -< n(1), n(a).'),
+        )
+
+    def test_derive_rules_1(self):
+        assert_that(set(seminaive.derive_rules(self.program))).is_equal_to(set(derive_rules(self.program)))
+
+    def test_derive_rules_2(self):
+        program = Program.parse('''
+            r(X, Y) <- p(X), Y = X + 1000, q(Y).
+            s(X, Y) <- p(X), Y = X * 1.5, q(Y).
+            p(1).
+            p(2).
+            q(1001).
+            q(3.0).
+        ''')
+        for i in range(20):
+            program.add_rule(Rule.parse('q(%d).' % (2000 + i)))
+        assert_that(derive_rules(program)).contains_only(
+            Rule.parse('r(1, 1001) <- p(1), q(1001).'),
+            Rule.parse('s(2, 3.0) <- p(2), q(3.0).'),
+        )
+        assert_that(set(seminaive.derive_rules(program))).is_equal_to(set(derive_rules(program)))
+
+    def test_derive_rules_3(self):
+        rule = Rule.parse('p(X) <- X > 1.')
+        assert_that(Program).raises(ValueError).when_called_with([rule])
+        assert_that(ReteNetwork().add_rule).raises(ValueError).when_called_with(rule)
+
+    def test_network_0(self):
+        network = ReteNetwork(instrumented=True)
+        network.add_program(self.program)
+        kinds = [entry['type'] for entry in network.profile()['nodes']]
+        assert_that(kinds).contains('filter', 'compute')
+
+    def test_retract_0(self):
+        network = ReteNetwork()
+        network.add_program(self.program)
+        assert_that(network.retract(Literal.parse('n(3)'))).contains_only(
+            Rule.parse('gt(3, 1) <- n(3), n(1).'),
+            Rule.parse('gt(3, 2) <- n(3), n(2).'),
+            Rule.parse('succ(2, 3) <- n(2), n(3).'),
+            Rule.parse('half(3, 1.5) <- n(3).'),
+            Rule.parse('other(1, 3) -< n(1), n(3).'),
+        )
+        assert_that(network.add_fact(Literal.parse('n(4)'))).contains(Rule.parse('gt(4, 2) <- n(4), n(2).'))
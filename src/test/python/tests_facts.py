@@ -0,0 +1,95 @@
+from unittest import TestCase
+
+from assertpy import assert_that
+
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.definitions import RuleType
+from depysible.domain.facts import FactStore
+from depysible.domain.interpretation import Answer
+from depysible.domain.interpretation import Interpreter
+
+
+class TestFactStore(TestCase):
+    def test__add__0(self):
+        store = FactStore()
+        assert_that(store.add(Literal.parse('a(b, 1)'))).is_true()
+        assert_that(store.add(Literal.parse('a(b, 1)'))).is_false()
+        assert_that(store).is_length(1)
+
+    def test__contains__0(self):
+        store = FactStore()
+        store.add(Literal.parse('a(b, 1)'))
+        assert_that(store.contains(Literal.parse('a(b, 1)'))).is_true()
+        assert_that(store.contains(Literal.parse('~a(b, 1)'))).is_false()
+        assert_that(store.contains(Literal.parse('a(b, True)'))).is_false()
+
+    def test__remove__0(self):
+        store = FactStore()
+        for i in range(5):
+            store.add(Literal.parse('a(%d)' % i))
+        assert_that(store.remove(Literal.parse('a(1)'))).is_true()
+        assert_that(store.remove(Literal.parse('a(1)'))).is_false()
+        assert_that(set(store.heads())).is_equal_to({Literal.parse('a(%d)' % i) for i in [0, 2, 3, 4]})
+
+    def test__remove__1(self):
+        store = FactStore()
+        store.add(Literal.parse('a'))
+        store.remove(Literal.parse('a'))
+        assert_that(store.tables).is_empty()
+
+    def test__iter__0(self):
+        store = FactStore()
+        store.add(Literal.parse('~a("x")'))
+        assert_that(list(store)).is_equal_to([Rule.parse('~a("x").')])
+
+
+class TestProgramFacts(TestCase):
+    def test__get_facts__0(self):
+        program = Program.parse('a(1). a(2). b(X) <- a(X).')
+        assert_that(program.facts).is_length(2)
+        assert_that(Rule.parse('a(1).') in program.get_facts()).is_true()
+
+    def test__get_facts__1(self):
+        fact = Rule(Literal.parse('a(1)'), RuleType.STRICT, [], 5)
+        program = Program([fact])
+        assert_that(list(program.rules)).is_equal_to([fact])
+        assert_that(Rule.parse('a(1).') in program.get_facts()).is_false()
+        assert_that(program.remove_rule(fact)).is_true()
+        assert_that(program.rules).is_empty()
+
+    def test__get_ground_program__0(self):
+        program = Program.parse('a(1). a(2). b(X) <- a(X).')
+        assert_that(set(program.get_ground_program().rules)).is_equal_to({
+            Rule.parse('a(1).'),
+            Rule.parse('a(2).'),
+            Rule.parse('b(1) <- a(1).'),
+            Rule.parse('b(2) <- a(2).'),
+        })
+
+    def test__get_derivations__0(self):
+        interpreter = Interpreter(Program.parse('a(1). b(X) <- a(X).'))
+        assert_that(interpreter.get_derivations(Literal.parse('a(1)'))).is_length(1)
+        assert_that(interpreter.get_derivations(Literal.parse('b(1)'))).is_length(1)
+
+    def test__query__0(self):
+        program = Program.parse('a(1). b(X) <- a(X).')
+        interpreter = Interpreter(program)
+        assert_that(interpreter.query(Literal.parse('b(2)'))[0]).is_equal_to(Answer.UNKNOWN)
+        program.add_rule(Rule.parse('a(2).'))
+        assert_that(interpreter.query(Literal.parse('b(2)'))[0]).is_equal_to(Answer.YES)
+
+    def test__query__1(self):
+        program = Program.parse('a(X) <- b(X). b(1).')
+        interpreter = Interpreter(program)
+        assert_that(interpreter.query(Literal.parse('a(1)'))[0]).is_equal_to(Answer.YES)
+        program.remove_rule(Rule.parse('a(X) <- b(X).'))
+        assert_that(interpreter.query(Literal.parse('a(1)'))[0]).is_equal_to(Answer.UNKNOWN)
+
+    def test__query__2(self):
+        program = Program.parse('a(X) <- b(X). b(1).')
+        program.get_ground_program(strategy='seminaive')
+        interpreter = Interpreter(program)
+        program.add_rule(Rule.parse('b(2).'))
+        assert_that(interpreter.query(Literal.parse('a(2)'))[0]).is_equal_to(Answer.YES)
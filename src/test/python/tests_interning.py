@@ -0,0 +1,91 @@
+import pickle
+from unittest import TestCase
+
+from assertpy import assert_that
+
+from depysible.domain.definitions import Atom
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Rule
+from depysible.domain.definitions import RuleType
+from depysible.domain.definitions import sort_key
+from depysible.domain.symbols import SYMBOLS
+from depysible.domain.symbols import SymbolTable
+
+
+class TestInterning(TestCase):
+    def test__atom__0(self):
+        assert_that(Atom('a', ['b', 5])).is_same_as(Atom('a', ['b', 5]))
+
+    def test__atom__1(self):
+        assert_that(Atom('a', [1])).is_not_same_as(Atom('a', [True]))
+
+    def test__atom__2(self):
+        assert_that(Atom('a', [1])).is_not_equal_to(Atom('a', [1.0]))
+
+    def test__literal__0(self):
+        assert_that(Literal.parse('~a(b)')).is_same_as(Literal(True, Atom('a', ['b'])))
+
+    def test__literal__1(self):
+        assert_that(Literal.parse('a(b)').get_complement().get_complement()).is_same_as(Literal.parse('a(b)'))
+
+    def test__rule__0(self):
+        assert_that(Rule.parse('a <- b.')).is_same_as(Rule(Literal.parse('a'), RuleType.STRICT, [Literal.parse('b')]))
+
+    def test__rule__1(self):
+        assert_that(Rule.parse('a -< b.')).is_not_equal_to(Rule.parse('a <- b.'))
+
+    def test__rule__2(self):
+        rule = Rule.parse('a(X) -< b(X), c.')
+        assert_that(hash(rule)).is_equal_to(hash(Rule.parse('a(X) -< b(X), c.')))
+
+    def test__pickle__0(self):
+        rule = Rule.parse('a(X) -< b(X), c.')
+        assert_that(pickle.loads(pickle.dumps(rule))).is_same_as(rule)
+
+
+class TestSortKey(TestCase):
+    def test__atom__0(self):
+        atoms = [Atom('a', ['b']), Atom('a', [2]), Atom('a', [1.5]), Atom('a', [])]
+        assert_that(sorted(atoms, key=sort_key)).is_equal_to(
+            [Atom('a', []), Atom('a', [1.5]), Atom('a', [2]), Atom('a', ['b'])]
+        )
+
+    def test__literal__0(self):
+        assert_that(Literal.parse('a(b)') < Literal.parse('~a(b)')).is_true()
+
+    def test__rule__0(self):
+        strict = Rule.parse('a(b) <- c(b).')
+        defeasible = Rule.parse('a(b) -< c(b).')
+        assert_that(sorted([defeasible, strict])).is_equal_to([strict, defeasible])
+
+    def test__rule__1(self):
+        rule = Rule.parse('a(X) <- b(X, 1), c(X).')
+        assert_that(rule.sort_key).is_same_as(Rule.parse('a(X) <- b(X, 1), c(X).').sort_key)
+
+
+class TestSymbolTable(TestCase):
+    def test__encode__0(self):
+        table = SymbolTable()
+        assert_that(table.encode('a')).is_equal_to(table.encode('a'))
+
+    def test__encode__1(self):
+        table = SymbolTable()
+        assert_that({table.encode(1), table.encode(True), table.encode(1.0), table.encode('1')}).is_length(4)
+
+    def test__encode__2(self):
+        table = SymbolTable()
+        table.encode(1)
+        assert_that(1 in table).is_true()
+        assert_that(True in table).is_false()
+        assert_that(table).is_length(1)
+
+    def test__decode__0(self):
+        table = SymbolTable()
+        assert_that(table.decode_all(table.encode_all(['a', 1, True]))).is_equal_to(['a', 1, True])
+
+    def test__atom__0(self):
+        atom = Atom('a', ['"b"', 5])
+        assert_that(atom.codes).is_equal_to(SYMBOLS.encode_all(['a', '"b"', 5]))
+
+    def test__atom__1(self):
+        assert_that(Atom('a', ['%s' % 'bc']).terms[0]).is_same_as(Atom('a', ['b' + 'c']).terms[0])
@@ -280,6 +280,65 @@ class TestLanguage(TestCase):
 
         assert_that(result).is_equal_to(expected)
 
+    def test__get_derivations__flies_tweety__defeasibly(self):
+        p = Program.parse("""
+            bird(X) <- chicken(X).
+            bird(X) <- penguin(X).
+            ~flies(X) <- penguin(X).
+            chicken(tina).
+            penguin(tweety).
+            scared(tina).
+            flies(X) -< bird(X).
+            flies(X) -< chicken(X), scared(X).
+            nests_in_trees(X) -< flies(X).
+            ~flies(X) -< chicken(X).
+        """)
+        i = Interpreter(p)
+        expected = set()
+        result = i.get_derivations(Literal.parse('flies(tweety)'), RuleType.DEFEASIBLE)
+
+        assert_that(result).is_equal_to(expected)
+
+    def test__get_derivations__nests_in_trees_tweety__defeasibly(self):
+        p = Program.parse("""
+            bird(X) <- chicken(X).
+            bird(X) <- penguin(X).
+            ~flies(X) <- penguin(X).
+            chicken(tina).
+            penguin(tweety).
+            scared(tina).
+            flies(X) -< bird(X).
+            flies(X) -< chicken(X), scared(X).
+            nests_in_trees(X) -< flies(X).
+            ~flies(X) -< chicken(X).
+        """)
+        i = Interpreter(p)
+        expected = set()
+        result = i.get_derivations(Literal.parse('nests_in_trees(tweety)'), RuleType.DEFEASIBLE)
+
+        assert_that(result).is_equal_to(expected)
+
+    def test__get_derivations__not_flies_tweety__defeasibly(self):
+        p = Program.parse("""
+            bird(X) <- chicken(X).
+            bird(X) <- penguin(X).
+            ~flies(X) <- penguin(X).
+            chicken(tina).
+            penguin(tweety).
+            scared(tina).
+            flies(X) -< bird(X).
+            flies(X) -< chicken(X), scared(X).
+            nests_in_trees(X) -< flies(X).
+            ~flies(X) -< chicken(X).
+        """)
+        i = Interpreter(p)
+        expected = {
+            Derivation([Rule.parse('~flies(tweety) <- penguin(tweety).'), Rule.parse('penguin(tweety).')], i),
+        }
+        result = i.get_derivations(Literal.parse('~flies(tweety)'), RuleType.DEFEASIBLE)
+
+        assert_that(result).is_equal_to(expected)
+
     def test__is_contradictory__defeasibly(self):
         p = Program.parse("""
             bird(X) <- chicken(X).
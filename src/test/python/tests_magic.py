@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+from assertpy import assert_that
+
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.interpretation import Answer
+from depysible.domain.interpretation import Interpreter
+from depysible.domain.magic import is_magic
+from depysible.domain.magic import rewrite
+from depysible.domain.rete import derive_rules
+from depysible.domain import magic
+
+BIRDS = """
+    bird(X) <- chicken(X).
+    bird(X) <- penguin(X).
+    ~flies(X) <- penguin(X).
+    flies(X) -< bird(X).
+    flies(X) -< chicken(X), scared(X).
+    ~flies(X) -< chicken(X).
+    nests_in_trees(X) -< flies(X).
+    chicken(tina).
+    penguin(tweety).
+    scared(tina).
+    parent(a, b).
+    grandparent(X, Y) <- parent(X, Z), parent(Z, Y).
+"""
+
+
+class TestMagic(TestCase):
+    def setUp(self):
+        self.program = Program.parse(BIRDS)
+
+    def test_rewrite_0(self):
+        rules, sources, seeds = rewrite(self.program, Literal.parse('flies(tina)'))
+        assert_that([repr(seed) for seed in seeds]).is_equal_to(['?flies/b(tina)', '?~flies/b(tina)'])
+        assert_that(set(sources.values())).contains(Rule.parse('flies(X) -< bird(X).'))
+        assert_that(set(sources.values())).does_not_contain(Rule.parse('nests_in_trees(X) -< flies(X).'))
+        assert_that(all(is_magic(rule.body[0]) for rule in rules)).is_true()
+
+    def test_derive_rules_0(self):
+        rules = magic.derive_rules(self.program, Literal.parse('flies(tina)'))
+        assert_that(rules).contains_only(
+            Rule.parse('bird(tina) <- chicken(tina).'),
+            Rule.parse('flies(tina) -< bird(tina).'),
+            Rule.parse('flies(tina) -< chicken(tina), scared(tina).'),
+            Rule.parse('~flies(tina) -< chicken(tina).'),
+        )
+        assert_that(derive_rules(self.program)).contains(*rules)
+
+    def test_derive_rules_1(self):
+        rules = magic.derive_rules(self.program, Literal.parse('grandparent(a, c)'))
+        assert_that(rules).is_empty()
+
+    def test_get_relevant_program_0(self):
+        program = self.program.get_relevant_program(Literal.parse('flies(tweety)'))
+        assert_that(set(program.rules)).is_equal_to({
+            Rule.parse('penguin(tweety).'),
+            Rule.parse('bird(tweety) <- penguin(tweety).'),
+            Rule.parse('~flies(tweety) <- penguin(tweety).'),
+            Rule.parse('flies(tweety) -< bird(tweety).'),
+        })
+
+    def test_query_0(self):
+        eager = Interpreter(self.program)
+        lazy = Interpreter(self.program, lazy=True)
+        for literal in {literal for rule in eager.program.rules for literal in (rule.head, *rule.body)}:
+            for query in (literal, literal.get_complement()):
+                assert_that(lazy.query(query)).is_equal_to(eager.query(query))
+        assert_that(lazy.program).is_same_as(self.program)
+
+    def test_query_1(self):
+        program = Program.parse('a(1). b(X) <- a(X).')
+        interpreter = Interpreter(program, lazy=True)
+        assert_that(interpreter.query(Literal.parse('b(2)'))[0]).is_equal_to(Answer.UNKNOWN)
+        program.add_rule(Rule.parse('a(2).'))
+        assert_that(interpreter.query(Literal.parse('b(2)'))[0]).is_equal_to(Answer.YES)
@@ -0,0 +1,59 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from assertpy import assert_that
+
+from depysible.domain.definitions import Atom
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.parallel import fire_rules
+from depysible.domain.rete import fire_rules as fire_rules_sequentially
+
+
+class TestParallel(TestCase):
+    def assert_same_as_sequential(self, program: Program):
+        expected = fire_rules_sequentially(program)
+        for workers in (1, 2, 3):
+            rules = fire_rules(program, workers)
+            assert_that(rules).is_length(len(expected))
+            assert_that(rules).contains_only(*expected)
+
+    def test_fire_rules_0(self):
+        self.assert_same_as_sequential(Program.parse("""
+            bird(X) <- chicken(X).
+            bird(X) <- penguin(X).
+            ~flies(X) <- penguin(X).
+            flies(X) -< bird(X).
+            flies(X) -< chicken(X), scared(X).
+            ~flies(tina) -< .
+            nests_in_trees(X) -< flies(X).
+            chicken(tina).
+            penguin(tweety).
+            scared(tina).
+        """))
+
+    def test_fire_rules_1(self):
+        rules = [Rule.parse('reaches(X, Y) <- edge(X, Y).'), Rule.parse('reaches(X, Z) <- reaches(X, Y), edge(Y, Z).')]
+        rules.extend(Literal(False, Atom('edge', ['n%d' % i, 'n%d' % ((i + 1) % 12)])).as_fact() for i in range(12))
+        self.assert_same_as_sequential(Program(rules))
+
+    def test_fire_rules_2(self):
+        self.assert_same_as_sequential(Program.parse("""
+            even(X) <- zero(X).
+            even(Y) <- odd(X), next(X, Y).
+            odd(Y) <- even(X), next(X, Y).
+            zero(0).
+            next(0, 1).
+            next(1, 2).
+            next(2, 3).
+        """))
+
+    def test_fire_rules_3(self):
+        with patch('multiprocessing.get_all_start_methods', return_value=['spawn']):
+            self.test_fire_rules_1()
+
+    def test_get_ground_program_0(self):
+        content = 'a(1). a(2). b(X) <- a(X). ~b(X) -< b(X).'
+        ground = Program.parse(content).get_ground_program(strategy='parallel')
+        assert_that(set(ground.rules)).is_equal_to(set(Program.parse(content).get_ground_program().rules))
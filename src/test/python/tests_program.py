@@ -0,0 +1,166 @@
+from io import StringIO
+
+from unittest import TestCase
+
+from assertpy import assert_that
+
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.definitions import RuleKind
+from depysible.domain.definitions import RuleType
+
+
+class TestProgram(TestCase):
+    def setUp(self):
+        self.program = Program.parse("""
+            bird(X) <- chicken(X).
+            ~flies(X) <- penguin(X).
+            chicken(tina).
+            penguin(tweety).
+            flies(X) -< bird(X).
+            ~flies(X) -< chicken(X).
+            ~flies(tina) -< .
+        """)
+
+    def test__get_facts__0(self):
+        assert_that(list(self.program.get_facts())).contains_only(
+            Rule.parse('chicken(tina).'),
+            Rule.parse('penguin(tweety).'),
+        )
+
+    def test__get_presumptions__0(self):
+        assert_that(list(self.program.get_presumptions())).contains_only(Rule.parse('~flies(tina) -< .'))
+
+    def test__get_rules__0(self):
+        assert_that(list(self.program.get_rules(RuleType.STRICT))).contains_only(
+            Rule.parse('bird(X) <- chicken(X).'),
+            Rule.parse('~flies(X) <- penguin(X).'),
+        )
+
+    def test__get_rules_by_head__0(self):
+        predicate = Literal.parse('~flies(X)').predicate
+        assert_that(list(self.program.get_rules_by_head(predicate, RuleKind.DEFEASIBLE))).contains_only(
+            Rule.parse('~flies(X) -< chicken(X).'),
+        )
+
+    def test__get_rules_by_head__1(self):
+        predicate = Literal.parse('~flies(X)').predicate
+        assert_that(list(self.program.get_rules_by_head(predicate))).is_length(3)
+
+    def test__get_rules_by_body__0(self):
+        predicate = Literal.parse('chicken(X)').predicate
+        assert_that(list(self.program.get_rules_by_body(predicate))).contains_only(
+            Rule.parse('bird(X) <- chicken(X).'),
+            Rule.parse('~flies(X) -< chicken(X).'),
+        )
+
+    def test__add_rule__0(self):
+        rule = Rule.parse('~flies(X) -< scared(X).')
+        assert_that(self.program.add_rule(rule)).is_true()
+        assert_that(self.program.add_rule(rule)).is_false()
+        predicate = Literal.parse('scared(X)').predicate
+        assert_that(list(self.program.get_rules_by_body(predicate))).contains_only(rule)
+
+    def test__remove_rule__0(self):
+        rule = Rule.parse('~flies(X) -< chicken(X).')
+        assert_that(self.program.remove_rule(rule)).is_true()
+        assert_that(self.program.remove_rule(rule)).is_false()
+        predicate = Literal.parse('chicken(X)').predicate
+        assert_that(list(self.program.get_rules_by_body(predicate, RuleKind.DEFEASIBLE))).is_empty()
+
+    def test__is_ground__0(self):
+        program = Program.parse('a(1). b(X) <- a(X).')
+        assert_that(program.is_ground()).is_false()
+        program.remove_rule(Rule.parse('b(X) <- a(X).'))
+        assert_that(program.is_ground()).is_true()
+
+    def test__get_strict__0(self):
+        assert_that(set(self.program.get_strict())).contains(
+            Rule.parse('bird(tina) <- chicken(tina).'),
+            Rule.parse('chicken(tina).'),
+        ).does_not_contain(Rule.parse('~flies(tina) -< .'))
+
+    def test__get_strict__1(self):
+        assert_that(self.program.get_strict()).is_equal_to(self.program.get_ground_program().get_strict())
+
+    def test__get_defeasible__0(self):
+        assert_that(set(self.program.get_defeasible())).contains(
+            Rule.parse('flies(tina) -< bird(tina).'),
+            Rule.parse('~flies(tina) -< .'),
+        ).does_not_contain(Rule.parse('chicken(tina).'))
+
+    def test__get_defeasible__1(self):
+        self.program.get_defeasible()
+        self.program.add_rule(Rule.parse('chicken(kiki).'))
+        assert_that(set(self.program.get_defeasible())).contains(Rule.parse('~flies(kiki) -< chicken(kiki).'))
+        self.program.remove_rule(Rule.parse('chicken(kiki).'))
+        assert_that(set(self.program.get_defeasible())).does_not_contain(Rule.parse('~flies(kiki) -< chicken(kiki).'))
+
+    def test__dump__0(self):
+        file = StringIO()
+        self.program.dump(file)
+        assert_that(file.getvalue()).is_equal_to(
+            '# Strict rules\n'
+            'bird(X) <- chicken(X).\n'
+            '~flies(X) <- penguin(X).\n'
+            '\n'
+            '# Facts\n'
+            'chicken(tina).\n'
+            'penguin(tweety).\n'
+            '\n'
+            '# Defeasible knowledge\n'
+            'flies(X) -< bird(X).\n'
+            '~flies(X) -< chicken(X).\n'
+            '~flies(tina) -< .'
+        )
+
+    def test__dump__1(self):
+        file = StringIO()
+        self.program.dump(file, ordered=False)
+        assert_that(file.getvalue().splitlines()).contains_only(*repr(self.program).splitlines())
+
+    def test__hash__0(self):
+        program = Program.parse("""
+            ~flies(tina) -< .
+            ~flies(X) -< chicken(X).
+            flies(X) -< bird(X).
+            penguin(tweety).
+            chicken(tina).
+            ~flies(X) <- penguin(X).
+            bird(X) <- chicken(X).
+        """)
+        assert_that(hash(self.program)).is_equal_to(hash(program))
+
+    def test__hash__1(self):
+        before = hash(self.program)
+        self.program.add_rule(Rule.parse('chicken(kiki).'))
+        assert_that(hash(self.program)).is_not_equal_to(before)
+        self.program.remove_rule(Rule.parse('chicken(kiki).'))
+        assert_that(hash(self.program)).is_equal_to(before)
+
+    def test__get_ground_program__0(self):
+        ground = self.program.get_ground_program()
+        self.program.add_rule(Rule.parse('chicken(kiki).'))
+        assert_that(self.program.get_ground_program()).is_same_as(ground)
+        assert_that(set(ground.rules)).is_equal_to(set(Program(list(self.program.rules)).get_ground_program().rules))
+
+    def test__get_ground_program__1(self):
+        ground = self.program.get_ground_program()
+        self.program.add_rule(Rule.parse('scared(X) -< chicken(X).'))
+        assert_that(set(ground.rules)).contains(Rule.parse('scared(tina) -< chicken(tina).'))
+
+    def test__get_ground_program__2(self):
+        ground = self.program.get_ground_program()
+        self.program.remove_rule(Rule.parse('chicken(tina).'))
+        assert_that(self.program.get_ground_program()).is_same_as(ground)
+        assert_that(set(ground.rules)).is_equal_to(set(Program(list(self.program.rules)).get_ground_program().rules))
+
+    def test__add_rule__1(self):
+        self.program.get_ground_program()
+        rules = set(self.program.rules)
+        assert_that(self.program.add_rule).raises(ValueError).when_called_with(Rule.parse('c(X) <- X > 1.'))
+        assert_that(set(self.program.rules)).is_equal_to(rules)
+        self.program.remove_rule(Rule.parse('bird(X) <- chicken(X).'))
+        ground = self.program.get_ground_program()
+        assert_that(ground.rules).does_not_contain(Rule.parse('bird(tina) <- chicken(tina).'))
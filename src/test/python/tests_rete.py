@@ -1,8 +1,22 @@
+import io
+import json
 from unittest import TestCase
 
 from assertpy import assert_that
 
 from depysible.domain.definitions import Atom
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.definitions import RuleType
+from depysible.domain.definitions import Variable
+from depysible.domain.rete import Agenda
+from depysible.domain.rete import Alfa
+from depysible.domain.rete import Beta
+from depysible.domain.rete import Root
+from depysible.domain.rete import ReteNetwork
+from depysible.domain.rete import fire_rules
+from depysible.domain.rete import stream_rules
 
 
 class TestAtomUnification(TestCase):
@@ -27,16 +41,480 @@ class TestAtomUnification(TestCase):
         assert_that(pattern.unifies(ground)).is_none()
 
     def test_unifies_4(self):
-        pattern = Atom('x', ['X'])
+        pattern = Atom('x', [Variable('X')])
         ground = Atom('x', [5])
         assert_that(pattern.unifies(ground)).contains_only('X').contains_entry({'X': 5})
 
     def test_unifies_5(self):
-        pattern = Atom('x', ['X', 'X'])
+        pattern = Atom('x', [Variable('X'), Variable('X')])
         ground = Atom('y', [5, 7])
         assert_that(pattern.unifies(ground)).is_none()
 
     def test_unifies_6(self):
-        pattern = Atom('x', ['X', 'Y'])
+        pattern = Atom('x', [Variable('X'), Variable('Y')])
         ground = Atom('x', [5, 'b'])
         assert_that(pattern.unifies(ground)).contains_only('X', 'Y').contains_entry({'X': 5}, {'Y': 'b'})
+
+
+class TestAtomGrounding(TestCase):
+    def test_is_ground_0(self):
+        assert_that(Literal.parse('x(a, 5, "X")').is_ground()).is_true()
+
+    def test_is_ground_1(self):
+        assert_that(Literal.parse('x(a, X)').is_ground()).is_false()
+
+    def test_is_ground_2(self):
+        assert_that(Literal.parse('x(X)').terms[0]).is_instance_of(Variable)
+
+    def test_is_ground_3(self):
+        assert_that(Atom('x', ['X']).is_ground()).is_true()
+
+
+class TestMatcher(TestCase):
+    def test_match_0(self):
+        matcher = Literal.parse('x(X, a, Y, X)').atom.matcher
+        assert_that(matcher.variables).is_equal_to(('X', 'Y'))
+
+    def test_match_1(self):
+        matcher = Literal.parse('x(X, a, Y, X)').atom.matcher
+        assert_that(matcher.match(Literal.parse('x(1, a, 2, 1)').atom)).is_equal_to((1, 2))
+
+    def test_match_2(self):
+        matcher = Literal.parse('x(X, a, Y, X)').atom.matcher
+        assert_that(matcher.match(Literal.parse('x(1, a, 2, 3)').atom)).is_none()
+
+    def test_match_3(self):
+        matcher = Literal.parse('x(X, a, Y, X)').atom.matcher
+        assert_that(matcher.match(Literal.parse('x(1, b, 2, 1)').atom)).is_none()
+
+    def test_match_4(self):
+        matcher = Literal.parse('x(X)').atom.matcher
+        assert_that(matcher.match(Literal.parse('x(1, 2)').atom)).is_none()
+
+
+class TestRoot(TestCase):
+    def test_notify_0(self):
+        root = Root()
+        alfas = [Alfa(Literal.parse(pattern), root) for pattern in ['x(X, a)', 'x(X, b)', '~x(X, a)', 'x(X, Y)']]
+        root.notify(Literal.parse('x(1, a)'))
+        root.run()
+        assert_that([len(alfa.memory) for alfa in alfas]).is_equal_to([1, 0, 0, 1])
+
+    def test_notify_1(self):
+        root = Root()
+        alfa = Alfa(Literal.parse('x(X, a)'), root)
+        root.notify(Literal.parse('x(1, a, 2)'))
+        root.notify(Literal.parse('y(1, a)'))
+        root.run()
+        assert_that(alfa.memory).is_empty()
+
+    def test_notify_2(self):
+        program = Program.parse("""
+            a(X) <- p(X), q(X).
+            b(X) <- p(X), q(X).
+            c(X) <- p(X).
+        """)
+        network = ReteNetwork()
+        network.add_program(program)
+        root = network.root
+        alfas = root.children[Literal.parse('p(X)').predicate][()][()]
+        assert_that(alfas).is_length(1)
+        assert_that(alfas[0].children).is_length(2)
+
+    def test_notify_3(self):
+        program = Program.parse("""
+            a(X) <- p(X), q(X).
+            b(Z) <- p(Z), q(Z).
+            c(Y) <- p(Y).
+        """)
+        network = ReteNetwork()
+        network.add_program(program)
+        alfas = network.root.children[Literal.parse('p(X)').predicate][()][()]
+        assert_that(alfas).is_length(1)
+        assert_that(alfas[0].children).is_length(2)
+        assert_that(network.table).is_length(3)
+
+    def test_notify_4(self):
+        program = Program.parse("""
+            a(X, Y) <- p(X, Y), q(Y).
+            b(U, V) <- p(V, U), q(U).
+            p(1, 2).
+            q(2).
+        """)
+        assert_that(ReteNetwork().add_program(program)).contains_only(
+            Rule.parse('a(1, 2) <- p(1, 2), q(2).'),
+            Rule.parse('b(2, 1) <- p(1, 2), q(2).'),
+        )
+
+    def test_run_0(self):
+        root = Root()
+        alfa = Alfa(Literal.parse('x(X)'), root)
+        root.notify_all(Literal.parse('x(%d)' % i) for i in range(5))
+        assert_that(root.run(2)).is_equal_to(2)
+        assert_that(alfa.memory).is_length(2)
+        assert_that(root).is_length(3)
+        assert_that(root.run()).is_equal_to(3)
+        assert_that(root.activations).is_equal_to(5)
+
+    def test_run_1(self):
+        root = Root(salience=True)
+        alfa = Alfa(Literal.parse('x(X)'), root)
+        root.notify(Literal.parse('x(1)'), 0)
+        root.notify(Literal.parse('x(2)'), 5)
+        root.notify(Literal.parse('x(3)'), 5)
+        root.run()
+        assert_that([binding for _, binding in alfa.memory]).is_equal_to([(2,), (3,), (1,)])
+
+    def test_run_2(self):
+        program = Program([
+            Rule.parse('p(1).'),
+            Rule.parse('a(X) <- p(X).'),
+            Rule(Literal.parse('b(X)'), RuleType.STRICT, [Literal.parse('p(X)')], 5),
+            Rule.parse('c(X) <- a(X).'),
+            Rule.parse('d(X) <- b(X).'),
+        ])
+        rules = fire_rules(program, salience=True)
+        assert_that(rules.index(Rule.parse('d(1) <- b(1).'))).is_less_than(rules.index(Rule.parse('c(1) <- a(1).')))
+
+
+class TestMemory(TestCase):
+    def test_notify_0(self):
+        root = Root()
+        alfa = Alfa(Literal.parse('x(X)'), root)
+        root.notify_all([Literal.parse('x(2)'), Literal.parse('x(1)'), Literal.parse('x(2)')])
+        root.run()
+        assert_that(list(alfa.memory)).is_equal_to([
+            ((Literal.parse('x(2)'),), (2,)),
+            ((Literal.parse('x(1)'),), (1,)),
+        ])
+
+    def test_fire_rules_0(self):
+        program = Program.parse("""
+            a(X) <- p(X).
+            b(X) <- p(X).
+            c(X) <- a(X), b(X).
+            p(1).
+            p(2).
+        """)
+        assert_that([repr(rule) for rule in fire_rules(program) if rule.body]).is_equal_to([
+            'a(1) <- p(1).',
+            'b(1) <- p(1).',
+            'a(2) <- p(2).',
+            'b(2) <- p(2).',
+            'c(1) <- a(1), b(1).',
+            'c(2) <- a(2), b(2).',
+        ])
+
+
+class TestBeta(TestCase):
+    def test_index_0(self):
+        root = Root()
+        alfa_1 = Alfa(Literal.parse('p(X, Y)'), root)
+        alfa_2 = Alfa(Literal.parse('q(Y)'), root)
+        alfa_3 = Alfa(Literal.parse('r(Y, Z)'), root)
+        beta_1 = Beta(alfa_1, alfa_2)
+        beta_2 = Beta(alfa_1, alfa_3)
+        assert_that(beta_1.index_1).is_same_as(beta_2.index_1)
+        assert_that(alfa_1.memory.indexes).is_length(1)
+
+    def test_index_1(self):
+        root = Root()
+        alfa_1 = Alfa(Literal.parse('p(X, Y)'), root)
+        alfa_2 = Alfa(Literal.parse('q(Y)'), root)
+        root.notify_all([Literal.parse('p(1, 2)'), Literal.parse('p(3, 4)')])
+        root.run()
+        beta = Beta(alfa_1, alfa_2)
+        assert_that(beta.index_1).is_equal_to({
+            (2,): [((Literal.parse('p(1, 2)'),), (1, 2))],
+            (4,): [((Literal.parse('p(3, 4)'),), (3, 4))],
+        })
+
+
+class TestJoin(TestCase):
+    def test_join_0(self):
+        program = Program.parse("""
+            grandparent(X, Y) <- parent(X, Z), parent(Z, Y).
+            parent(a, b).
+            parent(b, c).
+            parent(b, d).
+            parent(e, f).
+        """)
+        assert_that(fire_rules(program)).contains(
+            Rule.parse('grandparent(a, c) <- parent(a, b), parent(b, c).'),
+            Rule.parse('grandparent(a, d) <- parent(a, b), parent(b, d).'),
+        ).is_length(6)
+
+    def test_join_1(self):
+        program = Program.parse("""
+            pair(X, Y) <- item(X), item(Y).
+            item(a).
+            item(b).
+        """)
+        assert_that([rule for rule in fire_rules(program) if rule.body]).contains_only(
+            Rule.parse('pair(a, a) <- item(a), item(a).'),
+            Rule.parse('pair(a, b) <- item(a), item(b).'),
+            Rule.parse('pair(b, a) <- item(b), item(a).'),
+            Rule.parse('pair(b, b) <- item(b), item(b).'),
+        )
+
+    def test_join_2(self):
+        program = Program.parse("""
+            same(X) <- left(X), right(X).
+            left(1).
+            right(true).
+        """)
+        assert_that([rule for rule in fire_rules(program) if rule.body]).is_empty()
+
+    def test_join_3(self):
+        rules = [Rule.parse('reaches(n0).'), Rule.parse('reaches(Y) <- reaches(X), edge(X, Y).')]
+        rules.extend(Literal(False, Atom('edge', ['n%d' % i, 'n%d' % (i + 1)])).as_fact() for i in range(3000))
+        assert_that(fire_rules(Program(rules))).contains(
+            Rule.parse('reaches(n3000) <- reaches(n2999), edge(n2999, n3000).'))
+
+
+class TestReteNetwork(TestCase):
+    def setUp(self):
+        self.network = ReteNetwork()
+        self.network.add_program(Program.parse("""
+            grandparent(X, Y) <- parent(X, Z), parent(Z, Y).
+            parent(a, b).
+        """))
+
+    def test_add_fact_0(self):
+        assert_that(self.network.add_fact(Literal.parse('parent(b, c)'))).is_equal_to([
+            Rule.parse('grandparent(a, c) <- parent(a, b), parent(b, c).'),
+        ])
+
+    def test_add_fact_1(self):
+        self.network.add_fact(Literal.parse('parent(b, c)'))
+        assert_that(self.network.add_fact(Literal.parse('parent(b, c)'))).is_empty()
+
+    def test_add_rule_0(self):
+        self.network.add_fact(Literal.parse('parent(b, c)'))
+        assert_that(self.network.add_rule(Rule.parse('ancestor(X, Y) <- parent(X, Y).'))).contains_only(
+            Rule.parse('ancestor(a, b) <- parent(a, b).'),
+            Rule.parse('ancestor(b, c) <- parent(b, c).'),
+        )
+
+    def test_add_rules_0(self):
+        rules = self.network.add_rules([
+            Rule.parse('ancestor(X, Y) <- parent(X, Y).'),
+            Rule.parse('ancestor(X, Y) <- parent(X, Z), ancestor(Z, Y).'),
+            Rule.parse('parent(b, c).'),
+        ])
+        assert_that(rules).contains(
+            Rule.parse('grandparent(a, c) <- parent(a, b), parent(b, c).'),
+            Rule.parse('ancestor(a, c) <- parent(a, b), ancestor(b, c).'),
+        ).is_length(4)
+
+
+class TestAgenda(TestCase):
+    def setUp(self):
+        self.program = Program.parse("""
+            grandparent(X, Y) <- parent(X, Z), parent(Z, Y).
+            parent(a, b).
+            parent(b, c).
+            parent(b, d).
+        """)
+
+    def test_add_0(self):
+        agenda = Agenda()
+        agenda.add(Rule.parse('a(1) <- b(1).'))
+        agenda.add(Rule.parse('a(2) <- b(2).'))
+        agenda.add(Rule.parse('a(1) <- b(1).'))
+        assert_that(list(agenda)).is_equal_to([Rule.parse('a(1) <- b(1).'), Rule.parse('a(2) <- b(2).')])
+        assert_that(agenda.drain()).is_length(2)
+        assert_that(agenda.drain()).is_empty()
+
+    def test_sink_0(self):
+        rules = []
+        network = ReteNetwork(sink=rules.append)
+        assert_that(network.add_program(self.program)).is_empty()
+        assert_that(network.agenda).is_empty()
+        assert_that(rules).is_equal_to(ReteNetwork().add_program(self.program))
+
+    def test_sink_1(self):
+        network = ReteNetwork(sink=lambda rule: None)
+        network.add_program(self.program)
+        assert_that(network.root.produced).is_empty()
+        values = [rule for leaf in network.leaves.values() for rule in leaf.memory.tokens.values()]
+        assert_that(values).is_equal_to([None, None])
+        assert_that(network.retract).raises(ValueError).when_called_with(Literal.parse('parent(a, b)'))
+
+    def test_stream_0(self):
+        assert_that(list(ReteNetwork().stream(self.program, 1))).is_equal_to(
+            ReteNetwork().add_program(self.program))
+
+    def test_stream_rules_0(self):
+        assert_that(list(stream_rules(self.program))).is_equal_to(fire_rules(self.program))
+
+
+class TestJoinPlan(TestCase):
+    def setUp(self):
+        self.rule = Rule.parse('r(X, Z) <- big(X, Y), big(Y, Z), tiny(Z).')
+        self.program = Program.parse("""
+            r(X, Z) <- big(X, Y), big(Y, Z), tiny(Z).
+            big(a, b). big(b, c). big(c, d). big(d, e). big(b, d).
+            tiny(d).
+        """)
+
+    def test_plan_0(self):
+        network = ReteNetwork()
+        network.add_program(self.program)
+        assert_that(list(network.plans[self.rule])).is_equal_to([
+            Literal.parse('tiny(Z)'),
+            Literal.parse('big(Y, Z)'),
+            Literal.parse('big(X, Y)'),
+        ])
+
+    def test_plan_1(self):
+        network = ReteNetwork(planned=False)
+        network.add_program(self.program)
+        assert_that(list(network.plans[self.rule])).is_equal_to(list(self.rule.body))
+
+    def test_plan_2(self):
+        planned = ReteNetwork().add_program(self.program)
+        unplanned = ReteNetwork(planned=False).add_program(self.program)
+        assert_that(planned).contains_only(*unplanned).contains(
+            Rule.parse('r(a, d) <- big(a, b), big(b, d), tiny(d).'),
+        )
+
+    def test_explain_0(self):
+        network = ReteNetwork()
+        network.add_program(self.program)
+        assert_that(network.explain(self.rule).splitlines()).is_length(4)
+        assert_that(network.explain(self.rule)).starts_with(repr(self.rule)).contains('1. tiny(Z)')
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        self.network = ReteNetwork(instrumented=True)
+        self.network.add_program(Program.parse("""
+            grandparent(X, Y) <- parent(X, Z), parent(Z, Y).
+            parent(a, b).
+            parent(b, c).
+        """))
+
+    def test_profile_0(self):
+        nodes = {entry['type']: entry for entry in self.network.profile()['nodes']}
+        assert_that(nodes['alfa']).contains_entry({'activations': 2}, {'matches': 2}, {'memory': 2})
+        assert_that(nodes['beta']).contains_entry({'matches': 1}, {'memory': 1}, {'selectivity': 0.25})
+        assert_that(nodes['leaf']).contains_entry({'matches': 1}, {'parents': [nodes['beta']['id']]})
+
+    def test_profile_1(self):
+        assert_that(ReteNetwork().profile).raises(ValueError).when_called_with()
+
+    def test_profile_json_0(self):
+        assert_that(json.loads(self.network.profile_json())).is_equal_to(self.network.profile())
+
+    def test_profile_tree_0(self):
+        lines = self.network.profile_tree().splitlines()
+        assert_that(lines).is_length(4)
+        assert_that(lines[1]).starts_with('  #0 alfa parent(V0, V1)')
+        assert_that(lines[2]).contains('beta', 'selectivity=0.250000')
+        assert_that(lines[3]).starts_with('      #2 leaf grandparent(X, Y)')
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.source = """
+            grandparent(X, Y) <- parent(X, Z), parent(Z, Y).
+            parent(a, b).
+            parent(b, c).
+        """
+        self.program = Program.parse(self.source)
+        self.file = io.BytesIO()
+        self.program.save_snapshot(self.file)
+        self.file.seek(0)
+
+    def test_load_snapshot_0(self):
+        program = Program.parse(self.source)
+        ground = program.load_snapshot(self.file)
+        assert_that(set(ground.rules)).is_equal_to(set(self.program.get_ground_program().rules))
+        assert_that(program.get_ground_program()).is_same_as(ground)
+
+    def test_load_snapshot_1(self):
+        program = Program.parse(self.source)
+        program.load_snapshot(self.file)
+        program.add_rule(Rule.parse('parent(c, d).'))
+        assert_that(program.get_ground_program().rules).contains(
+            Rule.parse('grandparent(b, d) <- parent(b, c), parent(c, d).'),
+        )
+
+    def test_load_snapshot_2(self):
+        program = Program.parse(self.source)
+        program.add_rule(Rule.parse('parent(c, d).'))
+        assert_that(program.load_snapshot).raises(ValueError).when_called_with(self.file)
+
+    def test_load_0(self):
+        content = self.file.getvalue().replace(b'depysible-rete 1', b'depysible-rete 0', 1)
+        assert_that(ReteNetwork.load).raises(ValueError).when_called_with(io.BytesIO(content))
+
+    def test_save_0(self):
+        network = ReteNetwork(instrumented=True)
+        assert_that(network.save).raises(ValueError).when_called_with(io.BytesIO())
+
+
+class TestRetraction(TestCase):
+    def test_retract_0(self):
+        network = ReteNetwork()
+        network.add_program(Program.parse("""
+            grandparent(X, Y) <- parent(X, Z), parent(Z, Y).
+            parent(a, b).
+            parent(b, c).
+        """))
+        assert_that(network.retract(Literal.parse('parent(b, c)'))).is_equal_to([
+            Rule.parse('grandparent(a, c) <- parent(a, b), parent(b, c).'),
+        ])
+        assert_that(network.agenda).is_empty()
+
+    def test_retract_1(self):
+        network = ReteNetwork()
+        network.add_program(Program.parse("""
+            a(X) <- b(X).
+            a(X) <- c(X).
+            d(X) <- a(X).
+            b(1).
+            c(1).
+        """))
+        assert_that(network.retract(Literal.parse('b(1)'))).is_equal_to([Rule.parse('a(1) <- b(1).')])
+        assert_that(network.agenda).contains_only(Rule.parse('a(1) <- c(1).'), Rule.parse('d(1) <- a(1).'))
+
+    def test_retract_2(self):
+        network = ReteNetwork()
+        network.add_program(Program.parse("""
+            p(X) <- q(X).
+            q(X) <- p(X).
+            p(1).
+        """))
+        assert_that(network.retract(Literal.parse('p(1)'))).contains_only(
+            Rule.parse('q(1) <- p(1).'),
+            Rule.parse('p(1) <- q(1).'),
+        )
+        assert_that(network.agenda).is_empty()
+
+    def test_retract_3(self):
+        network = ReteNetwork()
+        network.add_program(Program.parse("""
+            pair(X, Y) <- item(X), item(Y).
+            item(a).
+            item(b).
+        """))
+        assert_that(network.retract(Literal.parse('item(b)'))).is_length(3)
+        assert_that(list(network.agenda)).is_equal_to([Rule.parse('pair(a, a) <- item(a), item(a).')])
+
+    def test_retract_4(self):
+        network = ReteNetwork()
+        network.add_program(Program.parse("""
+            a(X) <- b(X).
+            b(1).
+            b(1) -< .
+        """))
+        assert_that(network.retract(Literal.parse('b(1)'))).is_empty()
+        assert_that(network.retract(Literal.parse('b(1)'))).is_equal_to([Rule.parse('a(1) <- b(1).')])
+
+    def test_retract_5(self):
+        network = ReteNetwork()
+        network.add_program(Program.parse('a(X) <- b(X). b(1).'))
+        network.retract(Literal.parse('b(1)'))
+        assert_that(network.add_fact(Literal.parse('b(1)'))).is_equal_to([Rule.parse('a(1) <- b(1).')])
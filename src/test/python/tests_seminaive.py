@@ -0,0 +1,94 @@
+from unittest import TestCase
+
+from assertpy import assert_that
+
+from depysible.domain.definitions import Literal
+from depysible.domain.definitions import Program
+from depysible.domain.definitions import Rule
+from depysible.domain.rete import derive_rules
+from depysible.domain.seminaive import stratify
+from depysible.domain import seminaive
+
+
+class TestSemiNaive(TestCase):
+    def assert_same_as_rete(self, content: str):
+        program = Program.parse(content)
+        assert_that(seminaive.derive_rules(program)).contains_only(*derive_rules(program))
+
+    def test_derive_rules_0(self):
+        self.assert_same_as_rete("""
+            bird(X) <- chicken(X).
+            bird(X) <- penguin(X).
+            ~flies(X) <- penguin(X).
+            flies(X) -< bird(X).
+            flies(X) -< chicken(X), scared(X).
+            ~flies(tina) -< .
+            chicken(tina).
+            penguin(tweety).
+            scared(tina).
+        """)
+
+    def test_derive_rules_1(self):
+        self.assert_same_as_rete("""
+            reaches(X, Y) <- edge(X, Y).
+            reaches(X, Z) <- reaches(X, Y), edge(Y, Z).
+            edge(a, b).
+            edge(b, c).
+            edge(c, a).
+        """)
+
+    def test_derive_rules_2(self):
+        self.assert_same_as_rete("""
+            pair(X, Y) <- item(X), item(Y).
+            same(X) <- edge(X, X).
+            loose(X, _) <- item(X).
+            item(1).
+            item(true).
+            edge(a, a).
+            edge(a, b).
+        """)
+
+    def test_derive_rules_3(self):
+        self.assert_same_as_rete("""
+            even(X) <- zero(X).
+            even(Y) <- odd(X), next(X, Y).
+            odd(Y) <- even(X), next(X, Y).
+            zero(0).
+            next(0, 1).
+            next(1, 2).
+            next(2, 3).
+        """)
+
+    def test_stratify_0(self):
+        rules = Program.parse("""
+            c(X) <- b(X).
+            b(X) <- a(X).
+            b(X) <- c(X).
+            d(X) <- c(X).
+        """).get_rules()
+        strata = stratify(rules)
+        assert_that(strata).is_length(2)
+        assert_that(strata[0]).contains_only(
+            Rule.parse('c(X) <- b(X).'),
+            Rule.parse('b(X) <- a(X).'),
+            Rule.parse('b(X) <- c(X).'),
+        )
+
+    def test_get_ground_program_0(self):
+        content = 'a(1). a(2). b(X) <- a(X). ~b(X) -< b(X).'
+        ground = Program.parse(content).get_ground_program(strategy='seminaive')
+        assert_that(set(ground.rules)).is_equal_to(set(Program.parse(content).get_ground_program().rules))
+        assert_that(ground.get_rules_by_head(Literal.parse('~b(1)').predicate)).is_length(2)
+
+    def test_get_ground_program_1(self):
+        program = Program.parse('a(1). b(X) <- a(X).')
+        assert_that(program.get_ground_program).raises(ValueError).when_called_with(strategy='magic')
+
+    def test_get_ground_program_2(self):
+        program = Program.parse('a(1). b(X) <- a(X).')
+        rete = program.get_ground_program()
+        ground = program.get_ground_program(strategy='seminaive')
+        assert_that(ground).is_not_same_as(rete)
+        assert_that(set(ground.rules)).is_equal_to(set(rete.rules))
+        assert_that(program.get_ground_program()).is_same_as(ground)
+        assert_that(program.get_ground_program(strategy='rete')).is_not_same_as(ground)